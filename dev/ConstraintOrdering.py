@@ -0,0 +1,74 @@
+import islpy as isl
+from dev.ConstraintTable import *
+
+
+class ConstraintOrdering:
+    """
+    Static ordering heuristics choosing the levels of the constraints of an isl.Set before a Quast is built from it.
+    An ordering is a tuple of heuristics, applied lexicographically (ties keep isl's order):
+        DISJUNCT_FREQUENCY:     constraints shared by more basic sets first (a constraint and its negation count as
+                                the same constraint)
+        PARAMETERS_FIRST:       constraints over parameters only before constraints over set dimensions
+        INVOLVED_DIMS:          constraints ordered by the dimensions they involve, so that constraints over the same
+                                dimensions are adjacent
+    The empty ordering keeps isl's order.
+    """
+
+    DISJUNCT_FREQUENCY = "disjunct_frequency"
+    PARAMETERS_FIRST = "parameters_first"
+    INVOLVED_DIMS = "involved_dims"
+
+    ISL_ORDERING = ()
+    DEFAULT_ORDERING = (DISJUNCT_FREQUENCY, PARAMETERS_FIRST, INVOLVED_DIMS)
+
+    # Description: returns one constraint per decision variable of basic_sets (constraints equal up to normalization
+    # or negation are one variable), sorted by the heuristics of ordering
+    # Return: list of isl.Constraints
+    @staticmethod
+    def order_constraints(basic_sets, ordering):
+        constraints = {}
+        frequencies = {}
+        for basic_set in basic_sets:
+            variable_keys = set()
+            for constraint in basic_set.get_constraints():
+                variable_key = ConstraintTable.get_variable_key(constraint)
+                if variable_key not in constraints:
+                    constraints[variable_key] = constraint
+                variable_keys.add(variable_key)
+            for variable_key in variable_keys:
+                frequencies[variable_key] = frequencies.get(variable_key, 0) + 1
+
+        def get_sort_key(variable_key):
+            constraint = constraints[variable_key]
+            sort_key = []
+            for heuristic in ordering:
+                if heuristic == ConstraintOrdering.DISJUNCT_FREQUENCY:
+                    sort_key.append(-frequencies[variable_key])
+                elif heuristic == ConstraintOrdering.PARAMETERS_FIRST:
+                    sort_key.append(ConstraintOrdering.involves_set_dims(constraint))
+                elif heuristic == ConstraintOrdering.INVOLVED_DIMS:
+                    sort_key.append(ConstraintOrdering.get_involved_dims(constraint))
+                else:
+                    raise Exception("Unknown constraint ordering heuristic " + str(heuristic))
+            return sort_key
+
+        return [constraints[variable_key] for variable_key in sorted(constraints, key=get_sort_key)]
+
+    # Return: bool -- whether constraint involves set dimensions or divs (and not only parameters)
+    @staticmethod
+    def involves_set_dims(constraint):
+        for dim_type in (isl.dim_type.set, isl.dim_type.div):
+            for pos in range(constraint.get_local_space().dim(dim_type)):
+                if not constraint.get_coefficient_val(dim_type, pos).is_zero():
+                    return True
+        return False
+
+    # Return: tuple of the (dim type, position) involved by constraint, parameters first
+    @staticmethod
+    def get_involved_dims(constraint):
+        involved_dims = []
+        for type_index, dim_type in enumerate((isl.dim_type.param, isl.dim_type.set, isl.dim_type.div)):
+            for pos in range(constraint.get_local_space().dim(dim_type)):
+                if not constraint.get_coefficient_val(dim_type, pos).is_zero():
+                    involved_dims.append((type_index, pos))
+        return tuple(involved_dims)
@@ -0,0 +1,117 @@
+from math import gcd
+
+
+class ConstraintRelations:
+    """
+    Relations between two literals, a literal being a constraint id or its negation (constraint_id, is_negated):
+    implication, disjointness (the literals have no common point) and covering (every point satisfies one of them).
+    Disjointness and covering reduce to implication: l1 and l2 are disjoint when l1 implies the negation of l2, and
+    cover the space when the negation of l1 implies l2.
+    Over the integers, an inequality a.x + c >= 0 with a != 0 contains points arbitrarily far in every direction but -a,
+    so it only implies the parallel inequalities a.x + d >= 0 with d >= c. Literals without divs are therefore related
+    in O(d) from their normalized keys: equalities as their two inequalities, disequalities implying no other literal.
+    The other pairs (divs, constant constraints, equalities without integer points, and an equality with the negation
+    of a non-parallel equality, whose hyperplanes may share no integer point) are decided by isl once and cached.
+    Each ConstraintRelations instance has the following variable attributes
+        constraint_table:   ConstraintTable of the constraint ids
+        implications:       Cache mapping (constraint_id, is_negated, other_id, other_is_negated) to the implications
+                            decided by isl
+        num_isl_checks:     Number of implications decided by isl
+    """
+
+    def __init__(self, constraint_table):
+        self.constraint_table = constraint_table
+        self.implications = {}
+        self.num_isl_checks = 0
+
+    # Description: decides whether every point satisfying constraint_id (its negation when is_negated) satisfies
+    # other_id (its negation when other_is_negated). Constraints of different spaces are never related.
+    # Return: bool
+    def implies(self, constraint_id, is_negated, other_id, other_is_negated):
+        if constraint_id == other_id and is_negated == other_is_negated:
+            return True
+        is_implied = self.__get_syntactic_implication(constraint_id, is_negated, other_id, other_is_negated)
+        if is_implied is None:
+            key = (constraint_id, is_negated, other_id, other_is_negated)
+            is_implied = self.implications.get(key)
+            if is_implied is None:
+                self.num_isl_checks = self.num_isl_checks + 1
+                is_implied = self.__get_literal_set(constraint_id, is_negated).is_subset(
+                    self.__get_literal_set(other_id, other_is_negated))
+                self.implications[key] = is_implied
+        return is_implied
+
+    # Return: bool -- whether no point satisfies both literals
+    def is_disjoint(self, constraint_id, is_negated, other_id, other_is_negated):
+        return self.implies(constraint_id, is_negated, other_id, not other_is_negated)
+
+    # Return: bool -- whether every point satisfies one of the literals
+    def covers(self, constraint_id, is_negated, other_id, other_is_negated):
+        return self.implies(constraint_id, not is_negated, other_id, other_is_negated)
+
+    # Description: drops the cached implications of released constraint ids
+    def release(self):
+        self.implications = {key: is_implied for key, is_implied in self.implications.items()
+                             if not self.constraint_table.is_released(key[0])
+                             and not self.constraint_table.is_released(key[2])}
+
+    # Description: returns the inequalities a.x + c >= 0 (a over the parameters and set dimensions) whose conjunction
+    # is constraint_id (its negation when is_negated): one for inequalities and their negations, two for equalities
+    # and none for disequalities
+    # Return: tuple of (coefficients, constant), None for constraints with divs, constant constraints and equalities
+    # without integer points
+    def get_inequalities(self, constraint_id, is_negated):
+        is_equality, _, coefficients, divs, constant = self.constraint_table.keys[constraint_id]
+        if divs:
+            return None
+        divisor = 0
+        for coefficient in coefficients:
+            divisor = gcd(divisor, coefficient)
+        if divisor != 1:
+            return None
+        if not is_equality:
+            if is_negated:
+                _, _, coefficients, _, constant = self.constraint_table.negated_keys[constraint_id]
+            return (coefficients, constant),
+        if is_negated:
+            return ()
+        return (coefficients, constant), (tuple(-coefficient for coefficient in coefficients), -constant)
+
+    # Return: bool, None when the literals are not both without divs
+    def __get_syntactic_implication(self, constraint_id, is_negated, other_id, other_is_negated):
+        keys = self.constraint_table.keys
+        if keys[constraint_id][1] != keys[other_id][1]:
+            return False
+        inequalities = self.get_inequalities(constraint_id, is_negated)
+        other_inequalities = self.get_inequalities(other_id, other_is_negated)
+        if inequalities is None or other_inequalities is None:
+            return None
+        if len(other_inequalities) == 1:
+            return ConstraintRelations.is_bounded(inequalities, *other_inequalities[0])
+        if len(other_inequalities) == 2:
+            # the hyperplane of an equality is only contained in itself (the same constraint id)
+            return False
+        # a disequality a.x + c != 0 is implied when a.x + c >= 1 or -a.x - c >= 1 is, or when the literal is an
+        # equality whose hyperplane has no integer point in common with a.x + c = 0 (left to isl)
+        _, _, coefficients, _, constant = keys[other_id]
+        negated_coefficients = tuple(-coefficient for coefficient in coefficients)
+        if ConstraintRelations.is_bounded(inequalities, coefficients, constant - 1) or \
+                ConstraintRelations.is_bounded(inequalities, negated_coefficients, -constant - 1):
+            return True
+        if len(inequalities) == 2 and inequalities[0][0] not in (coefficients, negated_coefficients):
+            return None
+        return False
+
+    # Return: bool -- whether one of inequalities implies a.x + constant >= 0, a being coefficients
+    @staticmethod
+    def is_bounded(inequalities, coefficients, constant):
+        for inequality_coefficients, inequality_constant in inequalities:
+            if inequality_coefficients == coefficients and inequality_constant <= constant:
+                return True
+        return False
+
+    # Return: isl.Set
+    def __get_literal_set(self, constraint_id, is_negated):
+        if is_negated:
+            return self.constraint_table.get_negated_set(constraint_id)
+        return self.constraint_table.get_set(constraint_id)
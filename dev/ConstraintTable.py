@@ -0,0 +1,186 @@
+import islpy as isl
+from math import gcd
+
+
+class ConstraintTable:
+    """
+    Interns affine constraints so that each distinct constraint is stored once and identified by a small integer id.
+    Over the integers the negation of an inequality a.x + c >= 0 is the inequality -a.x - c - 1 >= 0, so an inequality
+    and its negation are interned as the same constraint id (one decision variable), the negation being reported as
+    negated. Each ConstraintTable instance has the following variable attributes
+        ids:            Maps the normalized key of a constraint to (constraint id, is_negated)
+        constraints:    isl.Constraint of each constraint id
+        sets:           isl.Set (single constraint) of each constraint id, shared by every node testing it
+        negated_sets:   isl.Set of the negation of each constraint id, computed on first use
+        basic_sets:     isl.BasicSet (single constraint) of each constraint id
+        negated_basic_sets: isl.BasicSets whose union is the negation of each constraint id, computed on first use
+        keys:           Normalized key of each constraint id
+        negated_keys:   Normalized key of the negation of each constraint id (None when not interned)
+        dims_masks:     Bit mask of the parameters and set dimensions involved by each constraint id (all bits set, i.e.
+                        -1, for constraints involving divs)
+    Released constraint ids keep their position in the lists with None entries and are never reused.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.constraints = []
+        self.sets = []
+        self.negated_sets = []
+        self.keys = []
+        self.negated_keys = []
+        self.basic_sets = []
+        self.negated_basic_sets = []
+        self.dims_masks = []
+
+    # Description: returns the id of constraint, interning it if neither it nor its negation has been seen before.
+    # Nodes testing a negated constraint test constraint_id with swapped branches.
+    # Return: (int, bool) -- constraint id, whether constraint is the negation of the constraint id
+    def intern(self, constraint):
+        key = ConstraintTable.get_key(constraint)
+        interned = self.ids.get(key)
+        if interned is None:
+            constraint_id = len(self.constraints)
+            interned = (constraint_id, False)
+            self.ids[key] = interned
+            self.constraints.append(constraint)
+            self.basic_sets.append(isl.BasicSet.from_constraint(constraint))
+            self.sets.append(isl.Set.from_basic_set(self.basic_sets[constraint_id]))
+            self.negated_basic_sets.append(None)
+            self.keys.append(key)
+            self.dims_masks.append(ConstraintTable.get_dims_mask(key))
+            negated_constraint = ConstraintTable.get_negated_constraint(constraint)
+            if negated_constraint is None:
+                self.negated_sets.append(None)
+                self.negated_keys.append(None)
+            else:
+                negated_key = ConstraintTable.get_key(negated_constraint)
+                self.ids[negated_key] = (constraint_id, True)
+                self.negated_sets.append(isl.Set.from_basic_set(isl.BasicSet.from_constraint(negated_constraint)))
+                self.negated_keys.append(negated_key)
+        return interned
+
+    def get_constraint(self, constraint_id):
+        return self.constraints[constraint_id]
+
+    def get_set(self, constraint_id):
+        return self.sets[constraint_id]
+
+    # Description: returns the set of points violating constraint_id. This is a single inequality, except for
+    # equalities and constraints with unknown divs, whose complement is computed by isl once.
+    # Return: isl.Set
+    def get_negated_set(self, constraint_id):
+        negated_set = self.negated_sets[constraint_id]
+        if negated_set is None:
+            negated_set = self.sets[constraint_id].complement()
+            self.negated_sets[constraint_id] = negated_set
+        return negated_set
+
+    def get_basic_set(self, constraint_id):
+        return self.basic_sets[constraint_id]
+
+    # Description: returns the negation of constraint_id as a list of disjoint basic sets: a single inequality for
+    # inequalities, two inequalities for equalities
+    # Return: list of isl.BasicSets
+    def get_negated_basic_sets(self, constraint_id):
+        negated_basic_sets = self.negated_basic_sets[constraint_id]
+        if negated_basic_sets is None:
+            negated_basic_sets = self.get_negated_set(constraint_id).make_disjoint().get_basic_sets()
+            self.negated_basic_sets[constraint_id] = negated_basic_sets
+        return negated_basic_sets
+
+    def is_equality(self, constraint_id):
+        return self.keys[constraint_id][0]
+
+    # Description: drops constraint_id and its isl objects. Interning the constraint again gives a new constraint id.
+    def release(self, constraint_id):
+        del self.ids[self.keys[constraint_id]]
+        if self.negated_keys[constraint_id] is not None:
+            del self.ids[self.negated_keys[constraint_id]]
+        self.constraints[constraint_id] = None
+        self.sets[constraint_id] = None
+        self.negated_sets[constraint_id] = None
+        self.basic_sets[constraint_id] = None
+        self.negated_basic_sets[constraint_id] = None
+        self.keys[constraint_id] = None
+        self.negated_keys[constraint_id] = None
+        self.dims_masks[constraint_id] = None
+
+    def is_released(self, constraint_id):
+        return self.keys[constraint_id] is None
+
+    def __len__(self):
+        return len(self.constraints)
+
+    # Description: returns the integer negation of an inequality, or None when the negation is not a single
+    # constraint (equalities, and inequalities involving existentially quantified variables without explicit div
+    # representation)
+    # Return: isl.Constraint
+    @staticmethod
+    def get_negated_constraint(constraint):
+        if constraint.is_equality():
+            return None
+        local_space = constraint.get_local_space()
+        for pos in range(local_space.dim(isl.dim_type.div)):
+            if not constraint.get_coefficient_val(isl.dim_type.div, pos).is_zero() and local_space.get_div(pos).is_nan():
+                return None
+        return constraint.negate()
+
+    # Description: computes the bit mask of the parameters and set dimensions (in the order of the key coefficients)
+    # with a non-zero coefficient in the constraint of key. Constraints involving divs may involve any dimension.
+    # Return: int
+    @staticmethod
+    def get_dims_mask(key):
+        _, _, coefficients, divs, _ = key
+        if divs:
+            return -1
+        dims_mask = 0
+        for pos, coefficient in enumerate(coefficients):
+            if coefficient != 0:
+                dims_mask = dims_mask | (1 << pos)
+        return dims_mask
+
+    # Description: computes a key shared by constraint and its integer negation, i.e. identifying the constraint id
+    # the constraint is interned as
+    # Return: tuple
+    @staticmethod
+    def get_variable_key(constraint):
+        key = ConstraintTable.get_key(constraint)
+        negated_constraint = ConstraintTable.get_negated_constraint(constraint)
+        if negated_constraint is None:
+            return key
+        return min(key, ConstraintTable.get_key(negated_constraint))
+
+    # Description: computes a key identifying constraint up to integer normalization. Coefficients are divided by
+    # their gcd (rounding the constant of inequalities down, which is exact over the integers) and equalities are
+    # oriented so that their first non-zero coefficient is positive.
+    # Return: tuple (is_equality, space, coefficients, divs, constant)
+    @staticmethod
+    def get_key(constraint):
+        local_space = constraint.get_local_space()
+        coefficients = []
+        for dim_type in (isl.dim_type.param, isl.dim_type.set):
+            for pos in range(local_space.dim(dim_type)):
+                coefficients.append(constraint.get_coefficient_val(dim_type, pos).to_python())
+        divs = []
+        for pos in range(local_space.dim(isl.dim_type.div)):
+            coefficient = constraint.get_coefficient_val(isl.dim_type.div, pos).to_python()
+            if coefficient != 0:
+                divs.append((str(local_space.get_div(pos)), coefficient))
+        constant = constraint.get_constant_val().to_python()
+        is_equality = constraint.is_equality()
+
+        divisor = 0
+        for coefficient in coefficients:
+            divisor = gcd(divisor, coefficient)
+        for _, coefficient in divs:
+            divisor = gcd(divisor, coefficient)
+        if is_equality:
+            divisor = gcd(divisor, constant)
+            first = next((c for c in coefficients + [c for _, c in divs] if c != 0), constant)
+            if first < 0:
+                divisor = -divisor
+        if divisor not in (0, 1):
+            coefficients = [coefficient // divisor for coefficient in coefficients]
+            divs = [(div, coefficient // divisor) for div, coefficient in divs]
+            constant = constant // divisor
+        return is_equality, str(constraint.get_space()), tuple(coefficients), tuple(sorted(divs)), constant
@@ -140,6 +140,21 @@ def quast_project_out(num_non_equalities, num_experiments):
     return total_time / num_experiments, project_out_quast
 
 
+# Description: builds the quast of the set constructed by set_project_out (before projection) from its isl.Set with
+# each static constraint ordering
+# Return: dict mapping each ordering to the number of nodes of the quast
+def quast_ordering_node_counts(num_non_equalities):
+    param_dims = '[' + ', '.join('p_' + str(j) for j in range(num_non_equalities)) + ']'
+    set_ = isl.Set.universe(isl.Set(param_dims + ' -> {[i0] : }').get_space())
+    for i in range(num_non_equalities):
+        set_ = set_.subtract(isl.Set(param_dims + ' -> {[i0] : i0 = p_' + str(i) + ' }'))
+    node_counts = {}
+    for ordering in (Q.ConstraintOrdering.ISL_ORDERING, Q.ConstraintOrdering.DEFAULT_ORDERING):
+        quast = Q.Quast(set_, manager=Q.QuastManager(ordering=ordering))
+        node_counts[ordering] = quast.get_tree_size()
+    return node_counts
+
+
 if __name__ == "__main__":
     NUM_NON_EQUALITIES = 11
     quast_outputs = [0] * NUM_NON_EQUALITIES
@@ -152,6 +167,9 @@ if __name__ == "__main__":
         print("number of non-equalities = " + str(i))
         print("quast: " + str(quast_times[i]))
         print("set: " + str(set_times[i]))
+        print("quast nodes: " + str(quast_outputs[i].compute_tree_size()))
+        for ordering, node_count in quast_ordering_node_counts(i).items():
+            print("quast nodes built from set with ordering " + str(ordering) + ": " + str(node_count))
         print("-------------------------------------")
     x_axis = [i for i in range(NUM_NON_EQUALITIES)]
     plt.plot(x_axis, quast_times, 'r--', x_axis, set_times, 'b--')
@@ -1,7 +1,6 @@
 import islpy as isl
 import dev.Quast as Q
 from dev.Experiments.timer import Timer
-import sys
 
 
 def get_set(t, set_str, set_name=""):
@@ -103,7 +102,6 @@ def check_equality(t, set_, quast):
 
 
 def testing_07_28():
-    sys.setrecursionlimit(1500)
     t = Timer()
 
     str_set_1234 = "[p_0, p_1, p_2, p_3, p_4, p_5, p_6, p_7] -> { [i0] : (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_3 and p_7 > p_4 and p_7 > p_5 and p_7 > p_6) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_3 and p_7 > p_4 and p_7 > p_5 and p_7 < p_6)}"
@@ -113,10 +111,7 @@ def testing_07_28():
     quast_1234 = get_quast(t, set_1234, "quast_1234")
     quast_1233 = get_quast(t, set_1233, "quast_1233")
     quast_1233.visualize_tree("before")
-    quast_1233.prune_redundant_branches()
-    #quast_1233.merge_nodes()
-    quast_1233.prune_equal_children_nodes()
-    quast_1233.merge_nodes()
+    print(quast_1233.reduce())
     quast_1233.visualize_tree("after")
     print(quast_1233.reconstruct_set() == set_1233)
     # set_1235 = intersect_sets(t, set_1234, set_1233, "set_1234", "set_1233")
@@ -129,7 +124,6 @@ def testing_07_28():
 #testing_07_28()
 
 def main():
-    sys.setrecursionlimit(1750)
     t = Timer()
 
     str_set_1234 = "[p_0, p_1, p_2, p_3, p_4, p_5, p_6, p_7] -> { [i0] : (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_3 and p_7 > p_4 and p_7 > p_5 and p_7 > p_6) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_3 and p_7 > p_4 and p_7 > p_5 and p_7 < p_6) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_3 and p_7 > p_4 and p_7 > p_6 and p_7 < p_5) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_3 and p_7 > p_4 and p_7 < p_6 and p_7 < p_5) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_3 and p_7 > p_5 and p_7 > p_6 and p_7 < p_4) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_3 and p_7 > p_5 and p_7 < p_6 and p_7 < p_4) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_3 and p_7 > p_6 and p_7 < p_5 and p_7 < p_4) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_3 and p_7 < p_6 and p_7 < p_5 and p_7 < p_4) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_4 and p_7 > p_5 and p_7 > p_6 and p_7 < p_3) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_4 and p_7 > p_5 and p_7 < p_6 and p_7 < p_3) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_4 and p_7 > p_6 and p_7 < p_5 and p_7 < p_3) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_4 and p_7 < p_6 and p_7 < p_5 and p_7 < p_3) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_5 and p_7 > p_6 and p_7 < p_4 and p_7 < p_3) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_5 and p_7 < p_6 and p_7 < p_4 and p_7 < p_3) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 > p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_3) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_2 and p_7 < p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_3) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_3 and p_7 > p_4 and p_7 > p_5 and p_7 > p_6 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_3 and p_7 > p_4 and p_7 > p_5 and p_7 < p_6 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_3 and p_7 > p_4 and p_7 > p_6 and p_7 < p_5 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_3 and p_7 > p_4 and p_7 < p_6 and p_7 < p_5 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_3 and p_7 > p_5 and p_7 > p_6 and p_7 < p_4 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_3 and p_7 > p_5 and p_7 < p_6 and p_7 < p_4 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_3 and p_7 > p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_3 and p_7 < p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_4 and p_7 > p_5 and p_7 > p_6 and p_7 < p_3 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_4 and p_7 > p_5 and p_7 < p_6 and p_7 < p_3 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_4 and p_7 > p_6 and p_7 < p_5 and p_7 < p_3 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_4 and p_7 < p_6 and p_7 < p_5 and p_7 < p_3 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_5 and p_7 > p_6 and p_7 < p_4 and p_7 < p_3 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_5 and p_7 < p_6 and p_7 < p_4 and p_7 < p_3 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 > p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_3 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_1 and p_7 < p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_3 and p_7 < p_2) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_3 and p_7 > p_4 and p_7 > p_5 and p_7 > p_6 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_3 and p_7 > p_4 and p_7 > p_5 and p_7 < p_6 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_3 and p_7 > p_4 and p_7 > p_6 and p_7 < p_5 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_3 and p_7 > p_4 and p_7 < p_6 and p_7 < p_5 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_3 and p_7 > p_5 and p_7 > p_6 and p_7 < p_4 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_3 and p_7 > p_5 and p_7 < p_6 and p_7 < p_4 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_3 and p_7 > p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_3 and p_7 < p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_4 and p_7 > p_5 and p_7 > p_6 and p_7 < p_3 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_4 and p_7 > p_5 and p_7 < p_6 and p_7 < p_3 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_4 and p_7 > p_6 and p_7 < p_5 and p_7 < p_3 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_4 and p_7 < p_6 and p_7 < p_5 and p_7 < p_3 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_5 and p_7 > p_6 and p_7 < p_4 and p_7 < p_3 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_5 and p_7 < p_6 and p_7 < p_4 and p_7 < p_3 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 > p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_3 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_2 and p_7 < p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_3 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_3 and p_7 > p_4 and p_7 > p_5 and p_7 > p_6 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_3 and p_7 > p_4 and p_7 > p_5 and p_7 < p_6 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_3 and p_7 > p_4 and p_7 > p_6 and p_7 < p_5 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_3 and p_7 > p_4 and p_7 < p_6 and p_7 < p_5 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_3 and p_7 > p_5 and p_7 > p_6 and p_7 < p_4 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_3 and p_7 > p_5 and p_7 < p_6 and p_7 < p_4 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_3 and p_7 > p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_3 and p_7 < p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_4 and p_7 > p_5 and p_7 > p_6 and p_7 < p_3 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_4 and p_7 > p_5 and p_7 < p_6 and p_7 < p_3 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_4 and p_7 > p_6 and p_7 < p_5 and p_7 < p_3 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_4 and p_7 < p_6 and p_7 < p_5 and p_7 < p_3 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_5 and p_7 > p_6 and p_7 < p_4 and p_7 < p_3 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_5 and p_7 < p_6 and p_7 < p_4 and p_7 < p_3 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 > p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_3 and p_7 < p_2 and p_7 < p_1) or (i0 = p_7 and p_0 > 0 and p_7 < p_6 and p_7 < p_5 and p_7 < p_4 and p_7 < p_3 and p_7 < p_2 and p_7 < p_1) }"
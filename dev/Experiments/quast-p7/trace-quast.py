@@ -1,11 +1,9 @@
 import dev.Quast as Q
 import islpy as isl
-import sys
 from timeit import default_timer as timer
 outputfile = open('/Users/shubhangkulkarni/PycharmProjects/ANLSummer21/TraceFileAnalysis/quast-tracefile-sets', 'w')
 start = timer()
 
-sys.setrecursionlimit(1700)
 ctx1 = isl.DEFAULT_CONTEXT
 space1 = isl.Space.params_alloc( ctx1,  0)
 space2 = space1.copy()
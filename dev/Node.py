@@ -2,10 +2,13 @@ class Node(object):
     TERMINAL = 1
     NON_TERMINAL = 0
 
-    def __init__(self, bset, false_branch_node=None, true_branch_node=None, node_type=0):
+    __slots__ = ("true_branch_node", "false_branch_node", "bset", "constraint_id", "node_type", "__weakref__")
+
+    def __init__(self, bset, false_branch_node=None, true_branch_node=None, node_type=0, constraint_id=None):
         self.true_branch_node = true_branch_node
         self.false_branch_node = false_branch_node
         self.bset = bset
+        self.constraint_id = constraint_id
         self.node_type = node_type
 
     def is_terminal(self):
@@ -0,0 +1,286 @@
+import weakref
+from array import array
+from dev.Node import *
+
+
+class ObjectNodeStore:
+    """
+    Node store keeping every node as a Node object. Each ObjectNodeStore instance has the following variable attributes
+        constraint_table:   ConstraintTable of the constraints tested by the nodes
+        in_node:            Terminal Node
+        out_node:           Terminal Node
+        unique_table:       Maps (constraint_id, true_branch_node, false_branch_node) to the only Node with that content
+    """
+
+    def __init__(self, constraint_table):
+        self.constraint_table = constraint_table
+        self.in_node = Node(bset="TERMINAL", node_type=Node.TERMINAL)
+        self.out_node = Node(bset="TERMINAL", node_type=Node.TERMINAL)
+        self.unique_table = {}
+
+    def make_node(self, constraint_id, true_branch_node, false_branch_node):
+        key = (constraint_id, true_branch_node, false_branch_node)
+        node = self.unique_table.get(key)
+        if node is None:
+            node = Node(bset=self.constraint_table.get_set(constraint_id), false_branch_node=false_branch_node,
+                        true_branch_node=true_branch_node, constraint_id=constraint_id)
+            self.unique_table[key] = node
+        return node
+
+    def get_num_nodes(self):
+        return len(self.unique_table)
+
+    # Return: list of every Node of the unique table
+    def get_nodes(self):
+        return list(self.unique_table.values())
+
+    # Description: rewrites node in place to test constraint_id with the given successors, keeping its identity
+    def replace_node(self, node, constraint_id, true_branch_node, false_branch_node):
+        del self.unique_table[(node.constraint_id, node.true_branch_node, node.false_branch_node)]
+        node.constraint_id = constraint_id
+        node.bset = self.constraint_table.get_set(constraint_id)
+        node.true_branch_node = true_branch_node
+        node.false_branch_node = false_branch_node
+        self.unique_table[(constraint_id, true_branch_node, false_branch_node)] = node
+
+    def remove_node(self, node):
+        del self.unique_table[(node.constraint_id, node.true_branch_node, node.false_branch_node)]
+
+    # Description: removes every node not in live_nodes from the unique table
+    # Return: number of removed nodes
+    def retain_nodes(self, live_nodes):
+        num_nodes = len(self.unique_table)
+        self.unique_table = {key: node for key, node in self.unique_table.items() if node in live_nodes}
+        return num_nodes - len(self.unique_table)
+
+    # Description: counts the nodes (terminals included) reachable from root
+    # Return: int
+    def count_reachable(self, root):
+        visited = {root}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if not node.is_terminal():
+                for child in (node.true_branch_node, node.false_branch_node):
+                    if child not in visited:
+                        visited.add(child)
+                        stack.append(child)
+        return len(visited)
+
+
+class ArrayNodeStore:
+    """
+    Node store keeping nodes as rows of parallel int32 columns instead of Python objects. Row 0 is the out terminal and
+    row 1 the in terminal. The unique table is an open hash table stored in the same way: buckets holds the first row
+    of each bucket and next_rows chains the rows of a bucket, so that a node costs a few machine integers.
+    Nodes are handed out as NodeViews, created on demand and shared while referenced, so that nodes of the store can
+    be compared with "is" like Node objects. Each ArrayNodeStore instance has the following variable attributes
+        constraint_table:   ConstraintTable of the constraints tested by the nodes
+        constraint_ids:     Constraint id of each row (-1 for terminals)
+        true_rows:          Row of the true branch of each row
+        false_rows:         Row of the false branch of each row
+        next_rows:          Next row of the same unique table bucket (-1 at the end of a bucket)
+        buckets:            First row of each unique table bucket (-1 for empty buckets)
+        free_rows:          Rows of removed nodes, reused by make_node
+        in_node:            NodeView of the in terminal
+        out_node:           NodeView of the out terminal
+    """
+
+    OUT_ROW = 0
+    IN_ROW = 1
+    INITIAL_BUCKETS = 1 << 10
+
+    def __init__(self, constraint_table):
+        self.constraint_table = constraint_table
+        self.constraint_ids = array('i', [-1, -1])
+        self.true_rows = array('i', [ArrayNodeStore.OUT_ROW, ArrayNodeStore.IN_ROW])
+        self.false_rows = array('i', [ArrayNodeStore.OUT_ROW, ArrayNodeStore.IN_ROW])
+        self.next_rows = array('i', [-1, -1])
+        self.buckets = array('i', [-1]) * ArrayNodeStore.INITIAL_BUCKETS
+        self.free_rows = []
+        self.num_nodes = 0
+        self.views = weakref.WeakValueDictionary()
+        self.out_node = self.get_node(ArrayNodeStore.OUT_ROW)
+        self.in_node = self.get_node(ArrayNodeStore.IN_ROW)
+
+    # Description: returns the NodeView of row, sharing the view with every live reference to the row
+    # Return: NodeView
+    def get_node(self, row):
+        view = self.views.get(row)
+        if view is None:
+            view = NodeView(self, row)
+            self.views[row] = view
+        return view
+
+    def make_node(self, constraint_id, true_branch_node, false_branch_node):
+        true_row = true_branch_node.row
+        false_row = false_branch_node.row
+        bucket = self.__hash(constraint_id, true_row, false_row) & (len(self.buckets) - 1)
+        row = self.buckets[bucket]
+        while row != -1:
+            if self.constraint_ids[row] == constraint_id and self.true_rows[row] == true_row and \
+                    self.false_rows[row] == false_row:
+                return self.get_node(row)
+            row = self.next_rows[row]
+        if self.free_rows:
+            row = self.free_rows.pop()
+            self.constraint_ids[row] = constraint_id
+            self.true_rows[row] = true_row
+            self.false_rows[row] = false_row
+            self.next_rows[row] = self.buckets[bucket]
+        else:
+            row = len(self.constraint_ids)
+            self.constraint_ids.append(constraint_id)
+            self.true_rows.append(true_row)
+            self.false_rows.append(false_row)
+            self.next_rows.append(self.buckets[bucket])
+        self.buckets[bucket] = row
+        self.num_nodes = self.num_nodes + 1
+        if self.num_nodes > len(self.buckets):
+            self.__rehash(2 * len(self.buckets))
+        return self.get_node(row)
+
+    def get_num_nodes(self):
+        return self.num_nodes
+
+    # Return: list of the NodeViews of every row of the unique table
+    def get_nodes(self):
+        return [self.get_node(row) for row in self.__get_rows()]
+
+    # Description: rewrites the row of node in place to test constraint_id with the given successors, keeping its
+    # identity
+    def replace_node(self, node, constraint_id, true_branch_node, false_branch_node):
+        row = node.row
+        self.__unlink(row)
+        self.constraint_ids[row] = constraint_id
+        self.true_rows[row] = true_branch_node.row
+        self.false_rows[row] = false_branch_node.row
+        bucket = self.__hash(constraint_id, true_branch_node.row, false_branch_node.row) & (len(self.buckets) - 1)
+        self.next_rows[row] = self.buckets[bucket]
+        self.buckets[bucket] = row
+
+    def remove_node(self, node):
+        self.__unlink(node.row)
+        self.constraint_ids[node.row] = -1
+        self.free_rows.append(node.row)
+        self.num_nodes = self.num_nodes - 1
+
+    # Description: removes every node not in live_nodes from the unique table, their rows being reused by make_node
+    # Return: number of removed nodes
+    def retain_nodes(self, live_nodes):
+        live_rows = {node.row for node in live_nodes}
+        rows = self.__get_rows()
+        self.buckets = array('i', [-1]) * len(self.buckets)
+        mask = len(self.buckets) - 1
+        for row in rows:
+            if row in live_rows:
+                bucket = self.__hash(self.constraint_ids[row], self.true_rows[row], self.false_rows[row]) & mask
+                self.next_rows[row] = self.buckets[bucket]
+                self.buckets[bucket] = row
+            else:
+                self.constraint_ids[row] = -1
+                self.free_rows.append(row)
+        num_removed = self.num_nodes - len([row for row in rows if row in live_rows])
+        self.num_nodes = self.num_nodes - num_removed
+        return num_removed
+
+    # Description: counts the rows (terminals included) reachable from root by walking the columns
+    # Return: int
+    def count_reachable(self, root):
+        true_rows = self.true_rows
+        false_rows = self.false_rows
+        visited = {root.row}
+        stack = [root.row]
+        while stack:
+            row = stack.pop()
+            if row > ArrayNodeStore.IN_ROW:
+                for child in (true_rows[row], false_rows[row]):
+                    if child not in visited:
+                        visited.add(child)
+                        stack.append(child)
+        return len(visited)
+
+    # Description: approximate number of bytes used by the columns and the unique table
+    # Return: int
+    def get_memory_usage(self):
+        columns = (self.constraint_ids, self.true_rows, self.false_rows, self.next_rows, self.buckets)
+        return sum(len(column) * column.itemsize for column in columns)
+
+    @staticmethod
+    def __hash(constraint_id, true_row, false_row):
+        return (constraint_id * 12582917) ^ (true_row * 4256249) ^ (false_row * 741457)
+
+    def __rehash(self, num_buckets):
+        rows = self.__get_rows()
+        self.buckets = array('i', [-1]) * num_buckets
+        mask = num_buckets - 1
+        for row in rows:
+            bucket = self.__hash(self.constraint_ids[row], self.true_rows[row], self.false_rows[row]) & mask
+            self.next_rows[row] = self.buckets[bucket]
+            self.buckets[bucket] = row
+
+    # Return: list of the rows of the unique table
+    def __get_rows(self):
+        rows = []
+        for row in self.buckets:
+            while row != -1:
+                rows.append(row)
+                row = self.next_rows[row]
+        return rows
+
+    # Description: removes row from the chain of its unique table bucket
+    def __unlink(self, row):
+        bucket = self.__hash(self.constraint_ids[row], self.true_rows[row], self.false_rows[row]) & \
+            (len(self.buckets) - 1)
+        if self.buckets[bucket] == row:
+            self.buckets[bucket] = self.next_rows[row]
+            return
+        previous_row = self.buckets[bucket]
+        while self.next_rows[previous_row] != row:
+            previous_row = self.next_rows[previous_row]
+        self.next_rows[previous_row] = self.next_rows[row]
+
+
+class NodeView(object):
+    """
+    Node API over one row of an ArrayNodeStore. Successors, constraint and set are read from the store's columns.
+    """
+    __slots__ = ("store", "row", "__weakref__")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    @property
+    def true_branch_node(self):
+        if self.row <= ArrayNodeStore.IN_ROW:
+            return None
+        return self.store.get_node(self.store.true_rows[self.row])
+
+    @property
+    def false_branch_node(self):
+        if self.row <= ArrayNodeStore.IN_ROW:
+            return None
+        return self.store.get_node(self.store.false_rows[self.row])
+
+    @property
+    def constraint_id(self):
+        if self.row <= ArrayNodeStore.IN_ROW:
+            return None
+        return self.store.constraint_ids[self.row]
+
+    @property
+    def bset(self):
+        if self.row <= ArrayNodeStore.IN_ROW:
+            return "TERMINAL"
+        return self.store.constraint_table.get_set(self.store.constraint_ids[self.row])
+
+    @property
+    def node_type(self):
+        return Node.TERMINAL if self.row <= ArrayNodeStore.IN_ROW else Node.NON_TERMINAL
+
+    def is_terminal(self):
+        return self.row <= ArrayNodeStore.IN_ROW
+
+    def print_node(self):
+        print("Basic set: " + str(self.bset) + "\nTerminal: " + str(self.is_terminal()))
@@ -0,0 +1,86 @@
+class PathImplications:
+    """
+    Literals (constraint ids, possibly negated) along a root to node path, indexed to find the literal of the path
+    implying a constraint or its negation. As a literal without divs only implies parallel inequalities (see
+    ConstraintRelations), these literals are indexed by the coefficient vectors of their inequalities and compared by
+    their constants. Literals with divs or over another space are compared with the literals sharing a dimension with
+    them by the cached pairwise implications of ConstraintRelations. Each PathImplications instance has the following
+    variable attributes
+        relations:  ConstraintRelations of the constraint ids
+        space:      String of the space of the path
+        path:       (constraint_id, is_negated) of every pushed literal
+        literals:   Maps the constraint id of every pushed literal to is_negated
+        bounds:     Maps coefficient vectors a to the constants c of the pushed inequalities a.x + c >= 0
+        general:    Pushed literals compared with ConstraintRelations.implies
+    """
+
+    def __init__(self, relations, space):
+        self.relations = relations
+        self.space = str(space)
+        self.path = []
+        self.literals = {}
+        self.bounds = {}
+        self.general = []
+
+    def push(self, constraint_id, is_negated):
+        self.path.append((constraint_id, is_negated))
+        self.literals[constraint_id] = is_negated
+        inequalities = self.__get_inequalities(constraint_id, is_negated)
+        if inequalities is None:
+            self.general.append((constraint_id, is_negated))
+            return
+        for coefficients, constant in inequalities:
+            self.bounds.setdefault(coefficients, []).append(constant)
+
+    def pop(self):
+        constraint_id, is_negated = self.path.pop()
+        del self.literals[constraint_id]
+        inequalities = self.__get_inequalities(constraint_id, is_negated)
+        if inequalities is None:
+            self.general.pop()
+            return
+        for coefficients, _ in inequalities:
+            constants = self.bounds[coefficients]
+            constants.pop()
+            if len(constants) == 0:
+                del self.bounds[coefficients]
+
+    # Description: looks for a literal of the path implying constraint_id or its negation
+    # Return: False when constraint_id is implied, True when its negation is implied, None otherwise
+    def get_implied(self, constraint_id):
+        if constraint_id in self.literals:
+            return self.literals[constraint_id]
+        inequalities = self.__get_inequalities(constraint_id, False)
+        if inequalities is not None and len(inequalities) == 1:
+            if self.__is_bounded(*inequalities[0]):
+                return False
+            if self.__is_bounded(*self.__get_inequalities(constraint_id, True)[0]):
+                return True
+        elif inequalities is not None:
+            # a single literal never implies an equality of another constraint id, and implies the disequality
+            # a.x + c != 0 when it bounds a.x + c away from 0
+            (coefficients, constant), (negated_coefficients, negated_constant) = inequalities
+            if self.__is_bounded(coefficients, constant - 1) or \
+                    self.__is_bounded(negated_coefficients, negated_constant - 1):
+                return True
+        # literals with divs are compared with the literals sharing a dimension with them
+        dims_masks = self.relations.constraint_table.dims_masks
+        dims_mask = dims_masks[constraint_id]
+        for path_id, is_path_negated in (self.path if inequalities is None else self.general):
+            if not dims_masks[path_id] & dims_mask:
+                continue
+            for is_negated in (False, True):
+                if self.relations.implies(path_id, is_path_negated, constraint_id, is_negated):
+                    return is_negated
+        return None
+
+    # Return: bool -- whether an inequality a.x + d >= 0 of the path, with a the given coefficients, has d <= constant
+    def __is_bounded(self, coefficients, constant):
+        return any(path_constant <= constant for path_constant in self.bounds.get(coefficients, ()))
+
+    # Return: tuple of (coefficients, constant) of ConstraintRelations.get_inequalities, None for literals over
+    # another space
+    def __get_inequalities(self, constraint_id, is_negated):
+        if self.relations.constraint_table.keys[constraint_id][1] != self.space:
+            return None
+        return self.relations.get_inequalities(constraint_id, is_negated)
@@ -1,6 +1,10 @@
 import islpy as isl
 from graphviz import Digraph
-from V2.Node import *
+from dev.Node import *
+from dev.QuastManager import *
+from dev import Traversal
+from dev.Simplex import PathCondition
+from dev.PathImplications import PathImplications
 
 class Quast:
     """
@@ -10,20 +14,28 @@ class Quast:
         space:      islpy.Space that the underlying islpy.Set lives in
         root_node:  Root node of the Quast
         num_nodes:  Number of nodes in the Quast
+        manager:    QuastManager owning the nodes of the Quast (shared terminals and unique table)
     """
 
-    def __init__(self, set_=None, space=None, in_node=None, out_node=None):
+    DEFAULT_BATCH_SIZE = 64
+
+    def __init__(self, set_=None, space=None, in_node=None, out_node=None, manager=None, ordering=None):
         self.num_nodes = 0
+        self.root_node = None
+        self.manager = QuastManager.get_default() if manager is None else manager
+        self.manager.register_quast(self)
 
         # initialize when isl.Set is provided
         if set_ is not None:
-            T = None
-            for basic_set in set_.get_basic_sets():
-                bquast = BasicQuast(basic_set)
-                if T is None:
-                    T = bquast
-                else:
-                    T = bquast.union(T)
+            # place the new constraints of set_ with the static ordering heuristics (manager's unless given)
+            basic_sets = set_.get_basic_sets()
+            self.manager.intern_constraints(basic_sets, self.manager.ordering if ordering is None else ordering)
+            # every basic quast is built before the unions, so that a collection triggered by a union keeps the
+            # constraints interned above
+            bquasts = [BasicQuast(basic_set, manager=self.manager) for basic_set in basic_sets]
+            T = Quast.empty(set_.get_space(), manager=self.manager)
+            for bquast in bquasts:
+                T = bquast.union(T)
             self.update_num_nodes(T.get_tree_size())
             self.root_node = T.root_node
             self.in_node = T.in_node
@@ -33,8 +45,8 @@ class Quast:
         else:
             if space is None:
                 raise Exception("Cannot initialize Quast with Space None")
-            self.in_node = Node(bset="TERMINAL", node_type=Node.TERMINAL) if in_node is None else in_node
-            self.out_node = Node(bset="TERMINAL", node_type=Node.TERMINAL) if out_node is None else out_node
+            self.in_node = self.manager.in_node if in_node is None else in_node
+            self.out_node = self.manager.out_node if out_node is None else out_node
             self.set_space(space)
             self.root_node = None
 
@@ -46,14 +58,14 @@ class Quast:
         return Quast(bset)
 
     @staticmethod
-    def empty(space):
-        quast = Quast(space=space)
+    def empty(space, manager=None):
+        quast = Quast(space=space, manager=manager)
         quast.root_node = quast.out_node
         return quast
 
     @staticmethod
-    def universe(space):
-        quast = Quast(space=space)
+    def universe(space, manager=None):
+        quast = Quast(space=space, manager=manager)
         quast.root_node = quast.in_node
         return quast
 
@@ -68,14 +80,14 @@ class Quast:
         return self.copy()
 
     def set_tuple_id(self, id):
-        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node)
-        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, {}, self.__isl_set_tuple_id, id)
+        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node, manager=self.manager)
+        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, self.__isl_set_tuple_id, id)
         new_quast.set_space(new_quast.root_node.bset.get_space())
         return new_quast
 
     def reset_tuple_id(self):
-        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node)
-        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, {}, self.__isl_reset_tuple_id)
+        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node, manager=self.manager)
+        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, self.__isl_reset_tuple_id)
         new_quast.set_space(new_quast.root_node.bset.get_space())
         return new_quast
 
@@ -83,9 +95,9 @@ class Quast:
         upper_bound_constraint = isl.Constraint.inequality_alloc(self.get_space())
         upper_bound_constraint = upper_bound_constraint.set_coefficient_val(type, pos, isl.Val('-1'))
         upper_bound_constraint = upper_bound_constraint.set_constant_val(value)
-        upper_bound_set = isl.Set.universe(self.get_space()).add_constraint(upper_bound_constraint)
-        upper_bound_node = Node(bset=upper_bound_set, true_branch_node=self.root_node, false_branch_node=self.out_node)
-        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node)
+        upper_bound_node = self.manager.make_constraint_node(upper_bound_constraint, true_branch_node=self.root_node,
+                                                             false_branch_node=self.out_node)
+        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node, manager=self.manager)
         new_quast.root_node = upper_bound_node
         return new_quast
 
@@ -93,47 +105,50 @@ class Quast:
         lower_bound_constraint = isl.Constraint.inequality_alloc(self.get_space())
         lower_bound_constraint = lower_bound_constraint.set_coefficient_val(type, pos, isl.Val('1'))
         lower_bound_constraint = lower_bound_constraint.set_constant_val(value.neg())
-        lower_bound_set = isl.Set.universe(self.get_space()).add_constraint(lower_bound_constraint)
-        lower_bound_node = Node(bset=lower_bound_set, true_branch_node=self.root_node, false_branch_node=self.out_node)
-        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node)
+        lower_bound_node = self.manager.make_constraint_node(lower_bound_constraint, true_branch_node=self.root_node,
+                                                             false_branch_node=self.out_node)
+        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node, manager=self.manager)
         new_quast.root_node = lower_bound_node
         return new_quast
 
     def add_dims(self, type, n):
-        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node)
-        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, {}, self.__isl_add_dims, type, n)
+        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node, manager=self.manager)
+        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, self.__isl_add_dims, type, n)
         new_quast.set_space(new_quast.root_node.bset.get_space())
         return new_quast
 
     def remove_dims(self, type, first, n):
-        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node)
-        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, {}, self.__isl_remove_dims, type, first, n)
+        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node, manager=self.manager)
+        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, self.__isl_remove_dims, type, first, n)
         new_quast.set_space(new_quast.root_node.bset.get_space())
         return new_quast
 
     def insert_dims(self, type, pos, n):
-        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node)
-        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, {}, self.__isl_insert_dims, type, pos, n)
+        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node, manager=self.manager)
+        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, self.__isl_insert_dims, type, pos, n)
         new_quast.set_space(new_quast.root_node.bset.get_space())
         return new_quast
 
     def align_params(self, model):
-        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node)
-        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, {}, self.__isl_align_params, model)
+        new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node, manager=self.manager)
+        new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, self.__isl_align_params, model)
         if not new_quast.root_node.is_terminal():
             new_quast.set_space(new_quast.root_node.bset.get_space())
         return new_quast
 
     # Todo - can implement by traversing all paths (instead of first constructing the set and then getting basic sets)
     def get_basic_set_list(self):
-        return self.reconstruct_set().get_basic_list()
+        basic_set_list = isl.BasicSetList.alloc(self.get_space().get_ctx(), 0)
+        for basic_set in self.get_path_basic_sets():
+            basic_set_list = basic_set_list.add(basic_set)
+        return basic_set_list
 
     # TODO -- implement using project out
     def apply(self, map_):
         # new_quast = Quast(space=self.get_space(), out_node=self.out_node, in_node=self.in_node)
-        # new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, {}, self.__isl_apply, map_)
+        # new_quast.root_node = self.__apply_callback_to_every_node(self.root_node, self.__isl_apply, map_)
         # new_quast.set_space(new_quast.root_node.bset.get_space())
-        new_quast = Quast(self.reconstruct_set().apply(map_))
+        new_quast = Quast(self.reconstruct_set().apply(map_), manager=self.manager)
         return new_quast
 
     def params(self):
@@ -145,21 +160,7 @@ class Quast:
         bset1 = isl.Set.empty(self.get_space())
         bset2 = isl.Set.empty(quast.get_space())
         union_space = bset1.union(bset2).get_space()
-        if self.root_node.is_terminal():
-            union_quast = quast.copy()
-            union_quast.set_space(union_space)
-            return union_quast
-        elif quast.root_node.is_terminal():
-            union_quast = self.copy()
-            union_quast.set_space(union_space)
-            return union_quast
-        union_quast = Quast(space=union_space, in_node=quast.in_node, out_node=quast.out_node)
-        memo = {self.in_node: union_quast.in_node, self.out_node: quast.root_node}
-        union_quast.root_node = self.__union(self.root_node, memo)
-        union_quast.set_tree_size(self.get_tree_size() + quast.get_tree_size())
-        union_quast.prune_redundant_branches()
-        union_quast.simplify()
-        return union_quast
+        return self.__apply_operation(QuastManager.OP_OR, quast, union_space)
 
     def intersect(self, quast):
         # if self.get_space() != quast.get_space():
@@ -175,43 +176,44 @@ class Quast:
             bset2 = quast.root_node.bset
 
         intersection_space = bset1.intersect(bset2).get_space()
-        intersection_quast = Quast(space=intersection_space, in_node=quast.in_node, out_node=quast.out_node)
-        memo = {self.in_node: quast.root_node, self.out_node: intersection_quast.out_node}
-        intersection_quast.root_node = self.__intersect(self.root_node, memo)
-        intersection_quast.set_tree_size(self.get_tree_size() + quast.get_tree_size())
-        intersection_quast.prune_redundant_branches()
-        intersection_quast.simplify()
-        return intersection_quast
+        return self.__apply_operation(QuastManager.OP_AND, quast, intersection_space)
 
     def complement(self):
-        complement_quast = Quast(space=self.get_space(), in_node=self.out_node, out_node=self.in_node)
+        complement_quast = Quast(space=self.get_space(), in_node=self.out_node, out_node=self.in_node, manager=self.manager)
         complement_quast.root_node = self.root_node
         return complement_quast
 
     def is_empty(self):
-        return self.__is_empty(self.root_node, isl.Set.universe(self.get_space()), isl.Set.empty(self.get_space()))
+        path_condition = PathCondition(self.manager.constraint_table, self.get_space(), self.manager.relations)
+        return self.__is_empty(self.root_node, path_condition)
 
     def is_subset(self, quast):
         return self.intersect(quast.complement()).is_empty()
 
     def is_equal(self, quast):
+        # nodes are unique per manager, so the same root with the same terminals is the same set
+        if self.manager is quast.manager and self.in_node is quast.in_node and self.root_node is quast.root_node:
+            return True
         return self.reconstruct_set() == quast.reconstruct_set()
 
     def project_out(self, dim_type, first, n):
         # get the new projected out space
         projected_out_universe = isl.Set.universe(self.get_space()).project_out(dim_type, first, n)
         # create new projected out quast with the projected out space
-        project_out_quast = Quast(space=projected_out_universe.get_space(), in_node=self.in_node, out_node=self.out_node)
+        project_out_quast = Quast(space=projected_out_universe.get_space(), in_node=self.in_node, out_node=self.out_node, manager=self.manager)
         # construct the projected out quast
-        project_out_quast.root_node = self.__project_out(self.root_node, project_out_quast, [], {}, projected_out_universe, dim_type, first, n)
+        project_out_quast.root_node = Traversal.run(self.__project_out(self.root_node, project_out_quast, [], {}, projected_out_universe, dim_type, first, n))
         #project_out_quast.simplify()
         return project_out_quast
 
     def subtract(self, quast):
-        return self.intersect(quast.complement())
+        bset1 = isl.Set.empty(self.get_space())
+        bset2 = isl.Set.empty(quast.get_space())
+        difference_space = bset1.subtract(bset2).get_space()
+        return self.__apply_operation(QuastManager.OP_DIFF, quast, difference_space)
 
     def copy(self):
-        quast_copy = Quast(space=self.get_space(), in_node=self.in_node, out_node=self.out_node)
+        quast_copy = Quast(space=self.get_space(), in_node=self.in_node, out_node=self.out_node, manager=self.manager)
         quast_copy.root_node = self.root_node
         return quast_copy
 
@@ -219,8 +221,8 @@ class Quast:
     def flat_product(self, quast):
         extension_space = quast.get_space()
         extended_space = self.__get_extended_space(extension_space)
-        extended_space_self = Quast(space=extended_space)
-        extended_space_quast = Quast(space=extended_space)
+        extended_space_self = Quast(space=extended_space, manager=self.manager)
+        extended_space_quast = Quast(space=extended_space, manager=self.manager)
         self.__project_quast_into_extended_space(self.root_node, extended_space, extended_space_self, False)
         quast.__project_quast_into_extended_space(quast.root_node, extended_space, extended_space_quast, True)
         return extended_space_self.intersect(extended_space_quast)
@@ -228,7 +230,7 @@ class Quast:
     # Todo -- fix
     def extend_space(self, extension_space):
         extended_space = self.__get_extended_space(extension_space)
-        extended_space_quast = Quast(space=extended_space)
+        extended_space_quast = Quast(space=extended_space, manager=self.manager)
         self.__project_quast_into_extended_space(self.root_node, extended_space, extended_space_quast)
         return extended_space_quast
 
@@ -249,14 +251,65 @@ class Quast:
         self.num_nodes = tree_size
 
     def compute_tree_size(self):
-        return len(self.__get_node_set())
+        return self.manager.count_nodes(self.root_node)
 
     def update_num_nodes(self, num_additions):
         self.num_nodes = self.num_nodes + num_additions
 
-    def reconstruct_set(self):
-        memo = {}
-        return self.__reconstruct_set(self.root_node, memo)
+    # Description: converts the quast to an isl.Set from the basic sets of get_path_basic_sets, coalescing the union
+    # after every batch_size basic sets
+    # Return: isl.Set
+    def reconstruct_set(self, batch_size=DEFAULT_BATCH_SIZE):
+        set_ = isl.Set.empty(self.get_space())
+        batch = isl.Set.empty(self.get_space())
+        batch_length = 0
+        for basic_set in self.get_path_basic_sets():
+            batch = batch.union(basic_set)
+            batch_length = batch_length + 1
+            if batch_length == batch_size:
+                set_ = set_.union(batch).coalesce()
+                batch = isl.Set.empty(self.get_space())
+                batch_length = 0
+        return set_.union(batch).coalesce()
+
+    # Description: lazily yields the points of the quast as disjoint basic sets, one per feasible root to in_node path
+    # (paths through the false edge of an equality giving one basic set per side of its hyperplane). Paths are
+    # enumerated depth first with a PathCondition, so infeasible prefixes are dropped before their subDAG is visited,
+    # and the basic set of every prefix is kept on a stack, so each edge costs one intersection.
+    # Return: generator of isl.BasicSets
+    def get_path_basic_sets(self):
+        constraint_table = self.manager.constraint_table
+        path_condition = PathCondition(constraint_table, self.get_space(), self.manager.relations)
+        path_basic_sets = [isl.BasicSet.universe(self.get_space())]
+        # entries (node, edge, edge basic set), (None, None, None) popping the edge of a finished subDAG
+        stack = [(self.root_node, None, None)]
+        while stack:
+            curr_node, edge, edge_basic_set = stack.pop()
+            if curr_node is None:
+                path_condition.pop()
+                path_basic_sets.pop()
+                continue
+            if edge is not None:
+                path_condition.push(*edge)
+                path_basic_set = path_basic_sets[-1].intersect(edge_basic_set)
+                is_split = edge[1] and len(constraint_table.get_negated_basic_sets(edge[0])) > 1
+                if not path_condition.is_feasible() or (is_split and path_basic_set.is_empty()):
+                    path_condition.pop()
+                    continue
+                path_basic_sets.append(path_basic_set)
+                stack.append((None, None, None))
+            if curr_node is self.in_node:
+                yield path_basic_sets[-1]
+                continue
+            elif curr_node is self.out_node:
+                continue
+            constraint_id = curr_node.constraint_id
+            if curr_node.false_branch_node is not self.out_node:
+                for negated_basic_set in reversed(constraint_table.get_negated_basic_sets(constraint_id)):
+                    stack.append((curr_node.false_branch_node, (constraint_id, True), negated_basic_set))
+            if curr_node.true_branch_node is not self.out_node:
+                stack.append((curr_node.true_branch_node, (constraint_id, False),
+                              constraint_table.get_basic_set(constraint_id)))
 
     def visualize_tree(self, output_filename='quast'):
         dot = Digraph(format="pdf", comment='Quast Visualization')
@@ -313,113 +366,84 @@ class Quast:
     # Internal implementation of set operations in quast representation
     ########################################################################
 
-    def __apply_callback_to_every_node(self, node, memo, callback, *args):
-        if node.is_terminal():
-            return node
-        elif node in memo:
-            return memo[node]
-        else:
-            new_true_branch = self.__apply_callback_to_every_node(node.true_branch_node, memo, callback, *args)
-            new_false_branch = self.__apply_callback_to_every_node(node.false_branch_node, memo, callback, *args)
-            new_node = Node(callback(node.bset, *args), false_branch_node=new_false_branch,
-                            true_branch_node=new_true_branch)
-            memo[node] = new_node
-            return new_node
-
-    # root_to_node_true_set: is an isl.BasicSet of all the TRUE constraints along root to node path
-    # root_to_node_false_set: isl.Set (only or constraints) of all the FALSE constraints along the root to node path
-    def __is_empty(self, curr_node, root_to_node_true_set, root_to_node_false_set):
-        if curr_node is self.in_node:
-            return root_to_node_true_set.is_subset(root_to_node_false_set) #isl.Set.is_subset()
-        elif curr_node is self.out_node:
-            return True
-        else:
-            new_root_to_node_true_set = root_to_node_true_set.intersect(curr_node.bset)
-            is_true_branch_empty = self.__is_empty(curr_node.true_branch_node, new_root_to_node_true_set, root_to_node_false_set)
-            if not is_true_branch_empty:
+    # Description: combines self and quast with the binary operation op (a QuastManager truth table) using the
+    # manager's apply. The result is read with the manager's in_node meaning containment.
+    # Return: Quast
+    def __apply_operation(self, op, quast, space):
+        if self.manager is not quast.manager:
+            raise Exception("Cannot combine Quasts of different managers")
+        op = QuastManager.get_operation(op, self.in_node is not self.manager.in_node,
+                                        quast.in_node is not self.manager.in_node)
+        result_quast = Quast(space=space, manager=self.manager)
+        result_quast.root_node = self.manager.apply(op, self.root_node, quast.root_node)
+        self.manager.collect_if_needed()
+        self.manager.reorder_if_needed()
+        result_quast.set_tree_size(result_quast.compute_tree_size())
+        return result_quast
+
+    def __apply_callback_to_every_node(self, node, callback, *args):
+        return Traversal.transform(node, visit_terminal=lambda terminal: terminal,
+                                   visit_node=lambda curr_node, new_true_branch, new_false_branch:
+                                   self.__make_set_node(callback(curr_node.bset, *args),
+                                                        false_branch_node=new_false_branch,
+                                                        true_branch_node=new_true_branch))
+
+    # path_condition: PathCondition of the constraints along the root to node path. An edge is pushed on the
+    # incremental simplex when it is entered and popped when its subDAG is done, so extending a path by one edge
+    # costs a few pivots instead of a new isl problem. Infeasible prefixes are dropped, so reaching the in_node
+    # proves non-emptiness. Paths are explored depth first (true branches first) from an explicit stack of
+    # (node, edge) entries, where edge is the (constraint_id, is_negated) to push before visiting node, or None
+    # for the entry popping the edge of a finished subDAG.
+    def __is_empty(self, curr_node, path_condition):
+        stack = [(curr_node, None)]
+        while stack:
+            curr_node, edge = stack.pop()
+            if curr_node is None:
+                path_condition.pop()
+                continue
+            if edge is not None:
+                path_condition.push(*edge)
+                if not path_condition.is_feasible():
+                    path_condition.pop()
+                    continue
+                stack.append((None, None))
+            if curr_node is self.in_node:
                 return False
-            new_root_to_node_false_set = root_to_node_false_set.union(curr_node.bset)
-            is_false_branch_empty = self.__is_empty(curr_node.false_branch_node, root_to_node_true_set, new_root_to_node_false_set)
-            return is_false_branch_empty
-
-    # def __reconstruct_set_(self, curr_node):
-    #     if curr_node is self.in_node:
-    #         return isl.BasicSet.universe(self.get_space())
-    #     elif curr_node is self.out_node:
-    #         return isl.BasicSet.empty(self.get_space())
-    #     else:
-    #         true_branch_set = curr_node.bset.intersect(self.__reconstruct_set_(curr_node.true_branch_node))
-    #         false_branch_set = self.__negate_bset(curr_node.bset).intersect(
-    #             self.__reconstruct_set(curr_node.false_branch_node))
-    #         return true_branch_set.union(false_branch_set)
-
-    def __reconstruct_set(self, curr_node, memo):
-        # quast is a single node
-        if curr_node is self.in_node:
-            return isl.BasicSet.universe(self.get_space())
-        elif curr_node is self.out_node:
-            return isl.BasicSet.empty(self.get_space())
-        # current node has already been memoized
-        elif curr_node in memo:
-            return memo[curr_node]
-        # else compute memoization and memoize
-        else:
-            # true_branch_set = None
-            # false_branch_set = None
-            if curr_node.true_branch_node is self.in_node:
-                true_branch_set = curr_node.bset
-            elif curr_node.true_branch_node is self.out_node:
-                true_branch_set = isl.BasicSet.empty(self.get_space())
-            else:
-                true_branch_set = curr_node.bset.intersect(self.__reconstruct_set(curr_node.true_branch_node, memo))
-
-            if curr_node.false_branch_node is self.in_node:
-                false_branch_set = self.__negate_bset(curr_node.bset)
-            elif curr_node.false_branch_node is self.out_node:
-                false_branch_set = isl.BasicSet.empty(self.get_space())
-            else:
-                false_branch_set = self.__negate_bset(curr_node.bset).intersect(self.__reconstruct_set(curr_node.false_branch_node, memo))
-
-            curr_node_set = true_branch_set.union(false_branch_set)
-            memo[curr_node] = curr_node_set
-            return curr_node_set
-
-    def __intersect(self, curr_node, memo):
-        if curr_node in memo:
-            return memo[curr_node]
-        true_branch_node = self.__intersect(curr_node.true_branch_node, memo)
-        false_branch_node = self.__intersect(curr_node.false_branch_node, memo)
-        bset = curr_node.bset
-        new_node = Node(bset=bset, false_branch_node=false_branch_node, true_branch_node=true_branch_node)
-        memo[curr_node] = new_node
+            elif curr_node is self.out_node:
+                continue
+            if curr_node.false_branch_node is not self.out_node:
+                stack.append((curr_node.false_branch_node, (curr_node.constraint_id, True)))
+            if curr_node.true_branch_node is not self.out_node:
+                stack.append((curr_node.true_branch_node, (curr_node.constraint_id, False)))
+        return True
+
+    # Description: returns a node testing the conjunction of the constraints of set_ (at most one basic set). The node
+    # branches to true_branch_node when every constraint holds and to false_branch_node otherwise.
+    # Return: Node
+    def __make_set_node(self, set_, true_branch_node, false_branch_node):
+        bsets = [set_] if isinstance(set_, isl.BasicSet) else set_.get_basic_sets()
+        if not bsets:
+            return false_branch_node
+        if len(bsets) > 1:
+            print(set_)
+            raise Exception("node contains more than one basic set")
+        new_node = true_branch_node
+        for constraint in bsets[0].get_constraints():
+            new_node = self.manager.make_constraint_node(constraint, true_branch_node=new_node,
+                                                         false_branch_node=false_branch_node)
         return new_node
 
-    def __union(self, curr_node, memo):
-        if curr_node in memo:
-            return memo[curr_node]
-        true_branch_node = self.__union(curr_node.true_branch_node, memo)
-        false_branch_node = self.__union(curr_node.false_branch_node, memo)
-        bset = curr_node.bset
-        new_node = Node(bset=bset, false_branch_node=false_branch_node, true_branch_node=true_branch_node)
-        memo[curr_node] = new_node
-        return new_node
-
-    def __negate_bset(self, bset):
-        return bset.complement()
+    # Description: returns the set of points taking the false branch of node. The constraint table computes it once
+    # per constraint (a single inequality for inequalities), so no isl complement is computed per visit.
+    # Return: isl.Set
+    def __negate_node_set(self, node):
+        return self.manager.constraint_table.get_negated_set(node.constraint_id)
 
     def __visualize_tree(self, arcs, node):
-        if node.is_terminal():
-            return
-        else:
-            true_branch_arc = (node, node.true_branch_node, "T")
-            if true_branch_arc not in arcs:
-                arcs.add(true_branch_arc)
-                self.__visualize_tree(arcs, node.true_branch_node)
-
-            false_branch_arc = (node, node.false_branch_node, "F")
-            if false_branch_arc not in arcs:
-                arcs.add(false_branch_arc)
-                self.__visualize_tree(arcs, node.false_branch_node)
+        for curr_node in Traversal.post_order(node):
+            if not curr_node.is_terminal():
+                arcs.add((curr_node, curr_node.true_branch_node, "T"))
+                arcs.add((curr_node, curr_node.false_branch_node, "F"))
 
     def __get_visualization_label(self, node):
         if not node.is_terminal():
@@ -450,29 +474,24 @@ class Quast:
 
     def __project_quast_into_extended_space(self, curr_node, extended_space, extended_space_quast,
                                             quast_in_extension_space=False):
-        if curr_node is self.in_node:
-            return extended_space_quast.in_node
-        elif curr_node is self.out_node:
-            return extended_space_quast.out_node
-        else:
-            extended_true_branch = self.__project_quast_into_extended_space(curr_node.true_branch_node, extended_space,
-                                                                            extended_space_quast,
-                                                                            quast_in_extension_space)
-            extended_false_branch = self.__project_quast_into_extended_space(curr_node.false_branch_node,
-                                                                             extended_space,
-                                                                             extended_space_quast,
-                                                                             quast_in_extension_space)
+        def visit_terminal(node):
+            return extended_space_quast.in_node if node is self.in_node else extended_space_quast.out_node
+
+        def visit_node(node, extended_true_branch, extended_false_branch):
             extended_bset = isl.BasicSet.universe(extended_space)
-            for constraint in curr_node.bset.get_constraints():
+            for constraint in node.bset.get_constraints():
                 extended_bset = extended_bset.add_constraint(
                     self.__project_constraint_into_extended_space(constraint, extended_space,
                                                                   quast_in_extension_space))
-            extended_node = Node(bset=extended_bset, true_branch_node=extended_true_branch,
-                                 false_branch_node=extended_false_branch)
-            if curr_node is self.root_node:
-                extended_space_quast.root_node = extended_node
-            return extended_node
+            return self.__make_set_node(extended_bset, true_branch_node=extended_true_branch,
+                                        false_branch_node=extended_false_branch)
+
+        extended_node = Traversal.transform(curr_node, visit_terminal, visit_node)
+        if curr_node is self.root_node:
+            extended_space_quast.root_node = extended_node
+        return extended_node
 
+    # Generator function, run with Traversal.run
     def __project_out(self, node, project_out_quast, root_to_node_set, memo, new_universe, dim_type, first, n):
         if node is self.in_node:
             if not root_to_node_set:
@@ -482,18 +501,10 @@ class Quast:
                 for bset in root_to_node_set:
                     new_set = new_set.intersect(bset)
                 new_set = new_set.project_out(dim_type, first, n).compute_divs()
-                new_node = project_out_quast.in_node
-                next_false_branch_node = project_out_quast.out_node
+                new_node = project_out_quast.out_node
                 for bset in new_set.get_basic_sets():
-                    next_true_branch_node = project_out_quast.in_node
-                    constraints_as_bsets = [isl.Set.from_basic_set(isl.BasicSet.from_constraint(constraint)) for
-                                            constraint in bset.get_constraints()]
-                    new_node = next_true_branch_node
-                    for bset_constraint in constraints_as_bsets:
-                        new_node = Node(bset=bset_constraint, false_branch_node=next_false_branch_node,
-                                        true_branch_node=next_true_branch_node)
-                        next_true_branch_node = new_node
-                    next_false_branch_node = new_node
+                    new_node = self.__make_set_node(bset, true_branch_node=project_out_quast.in_node,
+                                                    false_branch_node=new_node)
                 #new_node, _ = self.__simplify(new_node, {})
                 return new_node
         elif node is self.out_node:
@@ -509,32 +520,24 @@ class Quast:
             if node.bset.involves_dims(dim_type, first, n):
                 # add the constraint to the set of true constraints from root, recurse and then remove.
                 root_to_node_set.append(node.bset)
-                new_true_branch_node = self.__project_out(node.true_branch_node, project_out_quast, root_to_node_set, memo, new_universe, dim_type, first, n)
+                new_true_branch_node = yield self.__project_out(node.true_branch_node, project_out_quast, root_to_node_set, memo, new_universe, dim_type, first, n)
                 root_to_node_set.pop()
-                negated_set = self.__negate_bset(node.bset)
+                negated_set = self.__negate_node_set(node)
                 root_to_node_set.append(negated_set)
-                new_false_branch_node = self.__project_out(node.false_branch_node, project_out_quast, root_to_node_set, memo, new_universe, dim_type, first, n)
+                new_false_branch_node = yield self.__project_out(node.false_branch_node, project_out_quast, root_to_node_set, memo, new_universe, dim_type, first, n)
                 root_to_node_set.pop()
-                new_node = self.__union(new_true_branch_node, {project_out_quast.out_node: new_false_branch_node, project_out_quast.in_node: project_out_quast.in_node})
+                # union of both projections, read with the terminals of project_out_quast
+                union_op = QuastManager.OP_OR if project_out_quast.in_node is self.manager.in_node else QuastManager.OP_AND
+                new_node = self.manager.apply(union_op, new_true_branch_node, new_false_branch_node)
             # else dimensions do not have any dimensions to be projected out
             else:
                 # Recurse on successors (post-order) without adding the node constraint to the root_to_node_set
-                new_true_branch_node = self.__project_out(node.true_branch_node, project_out_quast, root_to_node_set, memo, new_universe, dim_type, first, n)
-                new_false_branch_node = self.__project_out(node.false_branch_node, project_out_quast, root_to_node_set, memo, new_universe, dim_type, first, n)
+                new_true_branch_node = yield self.__project_out(node.true_branch_node, project_out_quast, root_to_node_set, memo, new_universe, dim_type, first, n)
+                new_false_branch_node = yield self.__project_out(node.false_branch_node, project_out_quast, root_to_node_set, memo, new_universe, dim_type, first, n)
                 # Project out the dimensions from the space of the set.
                 new_set = node.bset.project_out(dim_type, first, n).compute_divs()
-                next_true_branch_node = new_true_branch_node
-                bsets = new_set.get_basic_sets()
-                if len(bsets) > 1:
-                    print(new_set)
-                    raise Exception("node contains more than one basic set")
-                constraints_as_bsets = [isl.Set.from_basic_set(isl.BasicSet.from_constraint(constraint)) for constraint
-                                        in bsets[0].get_constraints()]
-                new_node = new_true_branch_node
-                for bset_constraint in constraints_as_bsets:
-                    new_node = Node(bset=bset_constraint, false_branch_node=new_false_branch_node,
-                                true_branch_node=next_true_branch_node)
-                    next_true_branch_node = new_node
+                new_node = self.__make_set_node(new_set, true_branch_node=new_true_branch_node,
+                                                false_branch_node=new_false_branch_node)
                 # new_node, _ = self.__simplify(new_node, {})
             memo[node][fset] = new_node
             return new_node
@@ -543,166 +546,182 @@ class Quast:
     # Quast API for optimizing tree representation of underlying sets
     ######################################################################
 
+    # Description: simplifies the quast in a single pass applying the following rules, each enabled by its switch
+    #     redundant:      a node whose constraint or its negation is implied by an edge of the path is replaced by
+    #                     the branch that is always taken
+    #     emptiness:      a branch whose path condition has no integer point is removed (needs an emptiness check per
+    #                     edge, so disabled by default)
+    #     isomorphic:     nodes built outside of the unique table are merged with their equal node of the unique table
+    # A node whose two branches become the same node is always replaced by that node, as the unique table never
+    # creates such nodes.
+    # Return: dict with the tree size before and after, and the number of applications of each rule
+    def reduce(self, redundant=True, emptiness=False, isomorphic=True):
+        stats = {"size_before": self.compute_tree_size(), "redundant_nodes": 0, "empty_branches": 0,
+                 "equal_children_nodes": 0, "merged_nodes": 0}
+        path_implications = None
+        if redundant:
+            path_implications = PathImplications(self.manager.relations, self.get_space())
+        path_condition = None
+        if emptiness:
+            path_condition = PathCondition(self.manager.constraint_table, self.get_space(), self.manager.relations)
+        self.root_node = Traversal.run(self.__reduce(self.root_node, [], path_implications, path_condition,
+                                                     isomorphic, self.__get_subdag_dims_masks(),
+                                                     self.__get_shared_nodes_memo(), stats))
+        stats["size_after"] = self.compute_tree_size()
+        return stats
+
     def prune_redundant_branches(self):
-        self.root_node, _ = self.__prune_redundant_branches(node=self.root_node, true_branch_ancestors=set(), false_branch_ancestors=set(), memo={})
+        self.reduce(redundant=True, emptiness=False, isomorphic=False)
 
     def prune_emptyset_branches(self):
-        self.root_node, _ = self.__prune_emptyset_branches(self.root_node, isl.Set.universe(self.get_space()))
+        self.reduce(redundant=False, emptiness=True, isomorphic=False)
 
     def prune_equal_children_nodes(self):
-        self.root_node, _ = self.__prune_equal_children_nodes(node=self.root_node, new_nodes_map={})
+        self.reduce(redundant=False, emptiness=False, isomorphic=False)
 
+    # Description: merges isomorphic subDAGs in a single bottom-up pass. The signature of a node is its constraint id
+    # with the merged nodes of its successors, and the manager's unique table maps each signature to one node, so the
+    # pass is linear in the number of nodes. Nodes created through the manager are already unique; the pass merges
+    # nodes built outside of it (e.g. Node objects linked by hand).
     def prune_isomorphic_subtrees(self):
-        MAX_MODIFICATIONS = 10
-        num_modifications = 0
-        modified = True
-        while modified and num_modifications < MAX_MODIFICATIONS:
-            modified = self.__detect_and_prune_isomorphic_subtrees()
-            num_modifications = num_modifications + 1
+        self.reduce(redundant=False, emptiness=False, isomorphic=True)
 
     def simplify(self):
-        self.root_node, _ = self.__simplify(self.root_node, {})
+        self.reduce()
 
     def merge_nodes(self):
-        self.root_node, _ = self.__merge_nodes(self.root_node, {})
+        self.prune_isomorphic_subtrees()
 
     ########################################################################
     # Internal implementation of quast optimization functions
     ########################################################################
 
-    def __simplify(self, node, isomorphic_nodes_memo, depth=0):
+    # The pass below carries state along root to node paths. It is a generator function run with Traversal.run, a
+    # recursive call being written "yield self.__reduce(...)", so the depth of a quast is not bounded by the recursion
+    # limit.
+
+    # path: (constraint_id, is_negated) of the edges along the root to node path
+    # path_implications: PathImplications of the path (None when redundant nodes are kept)
+    # path_condition: PathCondition of the path (None when empty branches are kept)
+    # is_merging: whether unchanged nodes are replaced by their node of the unique table
+    # dims_masks: maps every node to the bit mask of the dimensions involved by the constraints of its subDAG
+    # memo: maps nodes with several parents and their relevant path edges to the reduced node. Only the path edges
+    # connected to the subDAG of node through shared dimensions decide which of its nodes are redundant (an implication
+    # needs the two constraints to share a dimension) and which of its branches are empty (the path is feasible, and
+    # constraints over disjoint dimensions are independent), so shared subDAGs reached along paths that only differ
+    # in unrelated constraints are reduced once.
+    # stats: number of applications of each rule
+    def __reduce(self, node, path, path_implications, path_condition, is_merging, dims_masks, memo, stats):
         if node.is_terminal():
-            return node, False
-        elif (node.bset, node.true_branch_node, node.false_branch_node) in isomorphic_nodes_memo:
-            return isomorphic_nodes_memo[(node.bset, node.true_branch_node, node.false_branch_node)], True
-        else:
-            # post-order traversal
-            new_true_branch_node, is_true_modified = self.__simplify(node.true_branch_node, isomorphic_nodes_memo, depth+1)
-            new_false_branch_node, is_false_modified = self.__simplify(node.false_branch_node, isomorphic_nodes_memo, depth+1)
-
-            # prune redundant checks
-            if new_true_branch_node is new_false_branch_node:
-                isomorphic_nodes_memo[(node.bset, node.true_branch_node, node.false_branch_node)] = new_true_branch_node
-                return new_true_branch_node, True
-
-            if (node.bset, new_true_branch_node, new_false_branch_node) in isomorphic_nodes_memo:
-                return isomorphic_nodes_memo[(node.bset, new_true_branch_node, new_false_branch_node)], True
-
-            # case where node or any subtrees not to be pruned
-            elif not is_true_modified and not is_false_modified:
-                isomorphic_nodes_memo[(node.bset, node.true_branch_node, node.false_branch_node)] = node
-                return node, False
-            # case where subtree has been pruned but node not to be pruned
+            return node
+        if node in memo:
+            memo_key = self.__get_relevant_path_edges(path, dims_masks[node])
+            if memo_key in memo[node]:
+                return memo[node][memo_key]
+
+        implied_edge = None
+        if path_implications is not None:
+            implied_edge = path_implications.get_implied(node.constraint_id)
+        if implied_edge is not None:
+            stats["redundant_nodes"] = stats["redundant_nodes"] + 1
+            if implied_edge:
+                branch_node = node.false_branch_node
             else:
-                new_node = Node(bset=node.bset, true_branch_node=new_true_branch_node,
-                                false_branch_node=new_false_branch_node)
-                isomorphic_nodes_memo[(node.bset, new_true_branch_node, new_false_branch_node)] = new_node
-                return new_node, True
-
-    # merge two nodes containing the same set (constraint) and pointing to the same children nodes
-    def __merge_nodes(self, node, memo):
-        if node.is_terminal():
-            return node, False
-        elif (node.bset, node.true_branch_node, node.false_branch_node) in memo:
-            return (node.bset, node.true_branch_node, node.false_branch_node), True
+                branch_node = node.true_branch_node
+            new_node = yield self.__reduce(branch_node, path, path_implications, path_condition, is_merging,
+                                           dims_masks, memo, stats)
         else:
-            new_true_branch_node, is_true_modified = self.__merge_nodes(node.true_branch_node, memo)
-            new_false_branch_node, is_false_modified = self.__merge_nodes(node.false_branch_node, memo)
-
-            if not is_true_modified and not is_false_modified:
-                memo[(node.bset, node.true_branch_node, node.false_branch_node)] = node
-                return node, False
+            new_branch_nodes = []
+            for is_negated, branch_node in ((False, node.true_branch_node), (True, node.false_branch_node)):
+                path.append((node.constraint_id, is_negated))
+                if path_implications is not None:
+                    path_implications.push(node.constraint_id, is_negated)
+                if path_condition is not None:
+                    path_condition.push(node.constraint_id, is_negated)
+                if path_condition is not None and not path_condition.is_feasible():
+                    stats["empty_branches"] = stats["empty_branches"] + 1
+                    new_branch_nodes.append(None)
+                else:
+                    new_branch_node = yield self.__reduce(branch_node, path, path_implications, path_condition,
+                                                          is_merging, dims_masks, memo, stats)
+                    new_branch_nodes.append(new_branch_node)
+                if path_condition is not None:
+                    path_condition.pop()
+                if path_implications is not None:
+                    path_implications.pop()
+                path.pop()
+            new_true_branch_node, new_false_branch_node = new_branch_nodes
+            if new_true_branch_node is None and new_false_branch_node is None:
+                new_node = self.out_node
+            elif new_true_branch_node is None:
+                new_node = new_false_branch_node
+            elif new_false_branch_node is None:
+                new_node = new_true_branch_node
+            elif new_true_branch_node is new_false_branch_node:
+                stats["equal_children_nodes"] = stats["equal_children_nodes"] + 1
+                new_node = new_true_branch_node
+            elif new_true_branch_node is node.true_branch_node and new_false_branch_node is node.false_branch_node:
+                new_node = node
+                if is_merging:
+                    new_node = self.manager.make_node(node.constraint_id, true_branch_node=new_true_branch_node,
+                                                      false_branch_node=new_false_branch_node)
+                    if new_node is not node:
+                        stats["merged_nodes"] = stats["merged_nodes"] + 1
             else:
-                new_node = Node(bset=node.bset, true_branch_node=new_true_branch_node, false_branch_node=new_false_branch_node)
-                memo[(node.bset, node.true_branch_node, node.false_branch_node)] = new_node
-                return new_node, True
+                new_node = self.manager.make_node(node.constraint_id, true_branch_node=new_true_branch_node,
+                                                  false_branch_node=new_false_branch_node)
+        if node in memo:
+            memo[node][memo_key] = new_node
+        return new_node
 
-    # ancestors: maps set to true/false to indicate which branch was taken
-    def __prune_redundant_branches(self, node, true_branch_ancestors, false_branch_ancestors, memo):
-        if node.is_terminal():
-            return node, False
-        fset_true_ancestors = frozenset(true_branch_ancestors)
-        fset_false_ancestors = frozenset(false_branch_ancestors)
-        if node not in memo:
-            memo[node] = {}
-        if fset_true_ancestors not in memo[node]:
-            memo[node][fset_true_ancestors] = {}
-        if fset_false_ancestors in memo[node][fset_true_ancestors]:
-            return memo[node][fset_true_ancestors][fset_false_ancestors]
-
-        if node.bset in true_branch_ancestors:
-            new_true_branch_node, _ = self.__prune_redundant_branches(node.true_branch_node,
-                                                                      true_branch_ancestors,
-                                                                      false_branch_ancestors, memo)
-            memo[node][fset_true_ancestors][fset_false_ancestors] = new_true_branch_node, True
-            return new_true_branch_node, True
-        elif node.bset in false_branch_ancestors:
-            new_false_branch_node, _ = self.__prune_redundant_branches(node.false_branch_node,
-                                                                       true_branch_ancestors,
-                                                                       false_branch_ancestors, memo)
-            memo[node][fset_true_ancestors][fset_false_ancestors] = new_false_branch_node, True
-            return new_false_branch_node, True
-        else:
-            true_branch_ancestors.add(node.bset)
-            new_true_branch_node, is_true_modified = self.__prune_redundant_branches(node.true_branch_node, true_branch_ancestors, false_branch_ancestors, memo)
-            true_branch_ancestors.remove(node.bset)
-
-            false_branch_ancestors.add(node.bset)
-            new_false_branch_node, is_false_modified = self.__prune_redundant_branches(node.false_branch_node, true_branch_ancestors, false_branch_ancestors, memo)
-            false_branch_ancestors.remove(node.bset)
-            if not is_false_modified and not is_true_modified:
-                memo[node][fset_true_ancestors][fset_false_ancestors] = node, False
-                return node, False
-            else:
-                new_node = Node(bset=node.bset, false_branch_node=new_false_branch_node, true_branch_node=new_true_branch_node)
-                memo[node][fset_true_ancestors][fset_false_ancestors] = new_node, True
-                return new_node, True
+    # Description: computes the bit mask of the dimensions involved by the constraints of the subDAG of every node
+    # Return: dict mapping Nodes to ints
+    def __get_subdag_dims_masks(self):
+        def visit_node(node, true_dims_mask, false_dims_mask):
+            return self.__get_dims_mask(node.constraint_id) | true_dims_mask | false_dims_mask
 
-    def __prune_emptyset_branches(self, node, root_to_node_set):
-        if node.is_terminal():
-            return node, False
-
-        root_to_true_node_set = root_to_node_set.intersect(node.bset)
-        root_to_false_node_set = root_to_node_set.intersect(self.__negate_bset(node.bset))
-
-        if root_to_true_node_set.is_empty():
-            new_false_branch_node, is_false_modified = self.__prune_emptyset_branches(node.false_branch_node,
-                                                                                      root_to_false_node_set)
-            return new_false_branch_node, True
-        elif root_to_false_node_set.is_empty():
-            new_true_branch_node, is_true_modified = self.__prune_emptyset_branches(node.true_branch_node,
-                                                                                    root_to_true_node_set)
-            return new_true_branch_node, True
-        else:
-            new_false_branch_node, is_false_modified = self.__prune_emptyset_branches(node.false_branch_node,
-                                                                                      root_to_false_node_set)
-            new_true_branch_node, is_true_modified = self.__prune_emptyset_branches(node.true_branch_node,
-                                                                                    root_to_true_node_set)
-            if is_false_modified or is_true_modified:
-                return Node(bset=node.bset, true_branch_node=new_true_branch_node, false_branch_node=new_false_branch_node), True
-            else:
-                return node, False
+        dims_masks = {}
+        Traversal.transform(self.root_node, lambda node: 0, visit_node, dims_masks)
+        return dims_masks
 
-    def __prune_equal_children_nodes(self, node, new_nodes_map):
-        if node.is_terminal():
-            return node, False
-        elif node in new_nodes_map:
-            return new_nodes_map[node], new_nodes_map[node] is node
-        elif node.true_branch_node is node.false_branch_node:
-            next_node, is_subtree_modified = self.__prune_equal_children_nodes(node.true_branch_node, new_nodes_map)
-            return next_node, True
-        else:
-            new_true_branch_node, is_true_branch_modified = self.__prune_equal_children_nodes(node.true_branch_node,
-                                                                                              new_nodes_map)
-            new_false_branch_node, is_false_branch_modified = self.__prune_equal_children_nodes(node.false_branch_node,
-                                                                                                new_nodes_map)
-            if is_true_branch_modified or is_false_branch_modified:
-                new_node = Node(bset=node.bset, true_branch_node=new_true_branch_node, false_branch_node=new_false_branch_node)
-                new_nodes_map[node] = new_node
-                return new_node, True
-            else:
-                new_nodes_map[node] = node
-                return node, False
+    # Description: creates the memo of a pass, with an empty dict for each node with several parents. Nodes with a
+    # single parent are reached once per visit of their parent, so only the others are memoized.
+    # Return: dict mapping Nodes to dicts
+    def __get_shared_nodes_memo(self):
+        memo = {}
+        referenced_nodes = set()
+        for node in Traversal.post_order(self.root_node):
+            for child in Traversal.get_children(node):
+                if child in referenced_nodes:
+                    memo[child] = {}
+                referenced_nodes.add(child)
+        return memo
+
+    # Description: selects the edges of path transitively sharing a dimension with dims_mask
+    # Return: frozenset of (constraint_id, is_negated)
+    def __get_relevant_path_edges(self, path, dims_mask):
+        relevant_edges = set()
+        is_extended = True
+        while is_extended:
+            is_extended = False
+            for edge in path:
+                if edge in relevant_edges:
+                    continue
+                edge_dims_mask = self.__get_dims_mask(edge[0])
+                if edge_dims_mask & dims_mask:
+                    relevant_edges.add(edge)
+                    dims_mask = dims_mask | edge_dims_mask
+                    is_extended = True
+        return frozenset(relevant_edges)
+
+    # Description: returns the bit mask of the dimensions involved by constraint_id, all bits for constraints over
+    # another space
+    # Return: int
+    def __get_dims_mask(self, constraint_id):
+        constraint_table = self.manager.constraint_table
+        if constraint_table.keys[constraint_id][1] != str(self.get_space()):
+            return -1
+        return constraint_table.dims_masks[constraint_id]
 
     def __is_constraint_valid(self, bset, constraint_list):
         basic_set = isl.BasicSet.universe(self.get_space())
@@ -710,77 +729,30 @@ class Quast:
             basic_set = basic_set.intersect(constraint)
         return basic_set.is_subset(bset)
 
-    def __detect_and_prune_isomorphic_subtrees(self):
-        node_set = self.__get_node_set()
-        memo_table = {}
-        for node1 in node_set:
-            for node2 in node_set:
-                if node1 is not node2 and self.__are_subtrees_isomorphic(node1, node2, memo_table):
-                    can_reach_node1 = self.__get_reachable_subDAG_as_dict(node1)
-                    if node2 in can_reach_node1:
-                        can_reach_node2 = self.__get_reachable_subDAG_as_dict(node2)
-                        can_reach_node2[node2] = node1
-                        self.__update_subDAG(can_reach_node2, self.root_node)
-                    else:
-                        can_reach_node1[node1] = node2
-                        self.__update_subDAG(can_reach_node1, self.root_node)
-                    return True
-        return False
-
-    def __are_subtrees_isomorphic(self, root1, root2, memo_table):
-        if not self.__are_nodes_equal(root1, root2):
-            return False
-        elif (root1, root2) in memo_table:
-            return memo_table[(root1, root2)]
-        elif (root2, root1) in memo_table:
-            return memo_table[(root2, root1)]
-        elif root1.is_terminal() or root2.is_terminal():
-            return root1 is root2
-        else:
-            are_isomorphic = self.__are_subtrees_isomorphic(
-                root1.true_branch_node, root2.true_branch_node, memo_table) and self.__are_subtrees_isomorphic(
-                root1.false_branch_node, root2.false_branch_node, memo_table)
-            memo_table[(root1, root2)] = are_isomorphic
-            memo_table[(root2, root1)] = are_isomorphic
-            return are_isomorphic
-
-    def __are_nodes_equal(self, node1, node2):
-        return node1.node_type == node2.node_type and node1.bset == node2.bset
-
     ########################################################################
     # Other internal functions
     ########################################################################
 
     # Description: returns a set of all nodes in the current quast
     # Return: Python.set of Nodes
-    def __get_node_set(self, node_set=None, curr_node=None):
-        if node_set is None:
-            node_set = set()
-            curr_node = self.root_node
-        if curr_node in node_set:
-            return
-        elif curr_node.is_terminal():
-            node_set.add(curr_node)
-        else:
-            node_set.add(curr_node)
-            self.__get_node_set(node_set=node_set, curr_node=curr_node.true_branch_node)
-            self.__get_node_set(node_set=node_set, curr_node=curr_node.false_branch_node)
-        if curr_node is self.root_node:
-            return node_set
+    def __get_node_set(self):
+        return set(Traversal.post_order(self.root_node))
 
 
 class BasicQuast(Quast):
 
-    def __init__(self, bset=None, space=None):
+    def __init__(self, bset=None, space=None, manager=None):
         space = bset.get_space() if bset is not None else space
-        super().__init__(set_=None, space=space)
+        super().__init__(set_=None, space=space, manager=manager)
 
-        # construct tree from bset
+        # construct tree from bset, bottom-up from the constraint of largest level so that no node needs reordering
         if bset is not None:
             next_true_branch_node = self.in_node
-            constraints_as_bsets = [isl.Set.from_basic_set(isl.BasicSet.from_constraint(constraint)) for constraint in bset.get_constraints()]
-            for bset_constraint in constraints_as_bsets:
-                node = Node(bset=bset_constraint, false_branch_node=self.out_node, true_branch_node=next_true_branch_node)
+            constraints = sorted(bset.get_constraints(), key=lambda constraint: -self.manager.levels[
+                self.manager.intern_constraint(constraint)[0]])
+            for constraint in constraints:
+                node = self.manager.make_constraint_node(constraint, false_branch_node=self.out_node,
+                                                         true_branch_node=next_true_branch_node)
                 next_true_branch_node = node
-            self.update_num_nodes(len(constraints_as_bsets))
+            self.update_num_nodes(len(constraints))
             self.root_node = next_true_branch_node
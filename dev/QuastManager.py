@@ -0,0 +1,351 @@
+import sys
+import weakref
+from collections import OrderedDict
+from dev.Node import *
+from dev.ConstraintTable import *
+from dev.ConstraintRelations import ConstraintRelations
+from dev.NodeStore import *
+from dev.Reordering import Reordering
+from dev.ConstraintOrdering import *
+
+
+class QuastManager:
+    """
+    Shared state for all Quasts built over the same nodes. Each QuastManager instance has the following variable
+    attributes
+        in_node:            Terminal node shared by every Quast of the manager
+        out_node:           Terminal node shared by every Quast of the manager
+        constraint_table:   ConstraintTable interning the constraint tested by every node
+        node_store:         Store holding the unique table, ObjectNodeStore (Node objects) or ArrayNodeStore (int32
+                            columns with NodeView objects), selected with store_type
+        levels:             Position of each constraint id in the variable order (smaller levels are closer to roots)
+        computed_table:     LRU cache mapping (op, u, v) to the result of apply, shared by all operations
+        cache_size:         Maximum number of computed_table entries (None for no limit)
+        cache_hits:         Number of apply calls answered by computed_table
+        cache_misses:       Number of apply calls that had to be computed
+        quasts:             Weak references to the live Quasts of the manager, whose roots are kept by reordering
+        reorder_threshold:  Number of nodes above which set operations reorder the constraint ids (None to disable)
+        reorder_growth:     After an automatic reordering, the threshold becomes reorder_growth times the new size
+        gc_threshold:       Number of nodes above which set operations collect garbage (None to disable)
+        gc_growth:          After an automatic collection, the threshold becomes gc_growth times the live nodes
+        num_collections:    Number of garbage collections
+        nodes_freed:        Number of nodes freed by garbage collection
+        constraints_freed:  Number of constraint ids freed by garbage collection
+        ordering:           Static ConstraintOrdering heuristics giving the levels of new constraints of Quasts built
+                            from isl.Sets
+        relations:          ConstraintRelations caching the implications between pairs of constraint ids or their
+                            negations
+    A Quast decides which of the two terminals means containment through its own in_node/out_node attributes, so
+    complementing a Quast never has to create nodes.
+
+    Binary set operations are given as truth tables: bit (2 * a + b) of the operation is the result for a point with
+    containment a in the first operand and b in the second.
+    """
+
+    OP_AND = 0b1000
+    OP_OR = 0b1110
+    OP_DIFF = 0b0100
+    OP_XOR = 0b0110
+    OP_NOT_FIRST = 0b0011
+
+    OBJECT_STORE = 0
+    ARRAY_STORE = 1
+
+    TERMINAL_LEVEL = sys.maxsize
+    DEFAULT_CACHE_SIZE = 1 << 18
+    DEFAULT_MAX_GROWTH = 1.2
+    DEFAULT_REORDER_GROWTH = 2
+    DEFAULT_GC_GROWTH = 2
+
+    __default_manager = None
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, store_type=OBJECT_STORE, reorder_threshold=None,
+                 gc_threshold=None, ordering=ConstraintOrdering.DEFAULT_ORDERING):
+        self.constraint_table = ConstraintTable()
+        if store_type == QuastManager.ARRAY_STORE:
+            self.node_store = ArrayNodeStore(self.constraint_table)
+        else:
+            self.node_store = ObjectNodeStore(self.constraint_table)
+        self.in_node = self.node_store.in_node
+        self.out_node = self.node_store.out_node
+        self.levels = []
+        self.computed_table = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.quasts = weakref.WeakSet()
+        self.reorder_threshold = reorder_threshold
+        self.reorder_growth = QuastManager.DEFAULT_REORDER_GROWTH
+        self.gc_threshold = gc_threshold
+        self.gc_growth = QuastManager.DEFAULT_GC_GROWTH
+        self.num_collections = 0
+        self.nodes_freed = 0
+        self.constraints_freed = 0
+        self.ordering = ordering
+        self.relations = ConstraintRelations(self.constraint_table)
+
+    @staticmethod
+    def get_default():
+        if QuastManager.__default_manager is None:
+            QuastManager.__default_manager = QuastManager()
+        return QuastManager.__default_manager
+
+    # Return: (int, bool) -- constraint id, whether constraint is the negation of the constraint id
+    def intern_constraint(self, constraint):
+        constraint_id, is_negated = self.constraint_table.intern(constraint)
+        if constraint_id == len(self.levels):
+            self.levels.append(constraint_id)
+        return constraint_id, is_negated
+
+    # Description: interns the constraints of basic_sets in the order given by the ConstraintOrdering heuristics of
+    # ordering. Constraints seen before keep their level, new constraints are placed below them in that order.
+    def intern_constraints(self, basic_sets, ordering):
+        for constraint in ConstraintOrdering.order_constraints(basic_sets, ordering):
+            self.intern_constraint(constraint)
+
+    def get_level(self, node):
+        if node.is_terminal():
+            return QuastManager.TERMINAL_LEVEL
+        return self.levels[node.constraint_id]
+
+    # Description: returns the unique node testing constraint_id with the given successors. Nodes whose successors
+    # are the same node are never created, the successor is returned instead.
+    # Return: Node
+    def make_node(self, constraint_id, true_branch_node, false_branch_node):
+        if true_branch_node is false_branch_node:
+            return true_branch_node
+        return self.node_store.make_node(constraint_id, true_branch_node, false_branch_node)
+
+    # Description: returns the unique node testing constraint (an isl.Constraint). A constraint interned as the
+    # negation of a constraint id is tested through that constraint id with swapped branches.
+    # Return: Node
+    def make_constraint_node(self, constraint, true_branch_node, false_branch_node):
+        constraint_id, is_negated = self.intern_constraint(constraint)
+        if is_negated:
+            return self.ite(constraint_id, true_branch_node=false_branch_node, false_branch_node=true_branch_node)
+        return self.ite(constraint_id, true_branch_node=true_branch_node, false_branch_node=false_branch_node)
+
+    # Description: returns a node selecting true_branch_node where constraint_id holds and false_branch_node
+    # elsewhere. Unlike make_node, the successors may test constraints placed before constraint_id in the variable
+    # order; the result is then built with apply so that the variable order is kept.
+    # Return: Node
+    def ite(self, constraint_id, true_branch_node, false_branch_node):
+        level = self.levels[constraint_id]
+        if level < self.get_level(true_branch_node) and level < self.get_level(false_branch_node):
+            return self.make_node(constraint_id, true_branch_node=true_branch_node, false_branch_node=false_branch_node)
+        true_literal = self.make_node(constraint_id, true_branch_node=self.in_node, false_branch_node=self.out_node)
+        false_literal = self.make_node(constraint_id, true_branch_node=self.out_node, false_branch_node=self.in_node)
+        return self.apply(QuastManager.OP_OR, self.apply(QuastManager.OP_AND, true_literal, true_branch_node),
+                          self.apply(QuastManager.OP_AND, false_literal, false_branch_node))
+
+    # Description: returns the truth table of op when the containment of the first (second) operand is read
+    # complemented, i.e. for operands whose in_node is the manager's out_node
+    # Return: int
+    @staticmethod
+    def get_operation(op, negate_first, negate_second):
+        new_op = 0
+        for a in (0, 1):
+            for b in (0, 1):
+                source_a = 1 - a if negate_first else a
+                source_b = 1 - b if negate_second else b
+                if op >> (2 * source_a + source_b) & 1:
+                    new_op = new_op | (1 << (2 * a + b))
+        return new_op
+
+    # Description: Bryant's apply. Combines the DAGs rooted at u and v (both read with the manager's in_node meaning
+    # containment) with the binary operation op, splitting on the constraint of smallest level. The result is
+    # ordered and reduced, every node being created through the unique table. The pairs of nodes still to combine
+    # are kept on an explicit stack, so the depth of the operands is not bounded by the recursion limit.
+    # Return: Node
+    def apply(self, op, u, v):
+        new_node = self.__apply_terminal_case(op, u, v)
+        if new_node is not None:
+            return new_node
+        # frames (True, key) expand the pair of key, frames (False, (key, constraint_id)) build the node of key from
+        # the two values most recently pushed on values (true branch first)
+        values = []
+        stack = [(True, self.__get_computed_table_key(op, u, v))]
+        while stack:
+            is_expand, frame = stack.pop()
+            if not is_expand:
+                key, constraint_id = frame
+                false_branch_node = values.pop()
+                true_branch_node = values.pop()
+                new_node = self.make_node(constraint_id, true_branch_node=true_branch_node,
+                                          false_branch_node=false_branch_node)
+                self.computed_table[key] = new_node
+                if self.cache_size is not None and len(self.computed_table) > self.cache_size:
+                    self.computed_table.popitem(last=False)
+                values.append(new_node)
+                continue
+            key = frame
+            _, u, v = key
+            new_node = self.__apply_terminal_case(op, u, v)
+            if new_node is None:
+                new_node = self.computed_table.get(key)
+                if new_node is not None:
+                    self.computed_table.move_to_end(key)
+                    self.cache_hits = self.cache_hits + 1
+            if new_node is not None:
+                values.append(new_node)
+                continue
+            self.cache_misses = self.cache_misses + 1
+            u_level = self.get_level(u)
+            v_level = self.get_level(v)
+            if u_level <= v_level:
+                constraint_id = u.constraint_id
+                u_true, u_false = u.true_branch_node, u.false_branch_node
+            else:
+                constraint_id = v.constraint_id
+                u_true, u_false = u, u
+            if v_level <= u_level:
+                v_true, v_false = v.true_branch_node, v.false_branch_node
+            else:
+                v_true, v_false = v, v
+            stack.append((False, (key, constraint_id)))
+            stack.append((True, self.__get_computed_table_key(op, u_false, v_false)))
+            stack.append((True, self.__get_computed_table_key(op, u_true, v_true)))
+        return values.pop()
+
+    # Description: terminal cases of apply, where the result is a terminal or one of the operands
+    # Return: Node, or None when op has to split on a constraint
+    def __apply_terminal_case(self, op, u, v):
+        if u.is_terminal() and v.is_terminal():
+            a = 1 if u is self.in_node else 0
+            b = 1 if v is self.in_node else 0
+            return self.in_node if op >> (2 * a + b) & 1 else self.out_node
+        if u.is_terminal():
+            row = (op >> (2 if u is self.in_node else 0)) & 0b11
+            if row != 0b01:
+                return self.__select_terminal_case(row, v)
+        if v.is_terminal():
+            b = 1 if v is self.in_node else 0
+            column = ((op >> b) & 1) | (((op >> (2 + b)) & 1) << 1)
+            if column != 0b01:
+                return self.__select_terminal_case(column, u)
+        if u is v:
+            diagonal = (op & 1) | (((op >> 3) & 1) << 1)
+            if diagonal != 0b01:
+                return self.__select_terminal_case(diagonal, u)
+        return None
+
+    # Description: operations symmetric in their operands share their computed table entries
+    # Return: tuple (op, u, v)
+    @staticmethod
+    def __get_computed_table_key(op, u, v):
+        if (op >> 1 & 1) == (op >> 2 & 1) and id(u) > id(v):
+            u, v = v, u
+        return op, u, v
+
+    def set_cache_size(self, cache_size):
+        self.cache_size = cache_size
+        while cache_size is not None and len(self.computed_table) > cache_size:
+            self.computed_table.popitem(last=False)
+
+    def clear_cache(self):
+        self.computed_table.clear()
+
+    # Return: dict with the size, capacity, hits and misses of the computed table
+    def get_cache_stats(self):
+        return {"size": len(self.computed_table), "capacity": self.cache_size, "hits": self.cache_hits,
+                "misses": self.cache_misses}
+
+    # case: bit 0 is the result when node is out, bit 1 when node is in. Case 0b01 (the negation of node) is not a
+    # terminal case and is handled by the recursion.
+    def __select_terminal_case(self, case, node):
+        if case == 0b00:
+            return self.out_node
+        elif case == 0b11:
+            return self.in_node
+        return node
+
+    def get_num_nodes(self):
+        return self.node_store.get_num_nodes()
+
+    def register_quast(self, quast):
+        self.quasts.add(quast)
+
+    # Description: mark and sweep garbage collection. Marks the nodes reachable from the roots of the live Quasts,
+    # removes every other node from the unique table and releases the constraint ids (with their isl objects and cached
+    # implications) no live node tests. The computed table is cleared, as it refers to nodes that may be freed. Nodes held outside of a
+    # Quast are not roots and must not be used after a collection.
+    # Return: dict with the number of nodes before the collection, of freed nodes and of freed constraint ids
+    def collect(self):
+        self.clear_cache()
+        live_nodes = set()
+        stack = [quast.root_node for quast in list(self.quasts) if quast.root_node is not None]
+        while stack:
+            node = stack.pop()
+            if not node.is_terminal() and node not in live_nodes:
+                live_nodes.add(node)
+                stack.append(node.true_branch_node)
+                stack.append(node.false_branch_node)
+        num_nodes = self.get_num_nodes()
+        num_freed_nodes = self.node_store.retain_nodes(live_nodes)
+        live_constraint_ids = {node.constraint_id for node in live_nodes}
+        num_freed_constraints = 0
+        for constraint_id in range(len(self.constraint_table)):
+            if constraint_id not in live_constraint_ids and not self.constraint_table.is_released(constraint_id):
+                self.constraint_table.release(constraint_id)
+                num_freed_constraints = num_freed_constraints + 1
+        if num_freed_constraints > 0:
+            self.relations.release()
+        self.num_collections = self.num_collections + 1
+        self.nodes_freed = self.nodes_freed + num_freed_nodes
+        self.constraints_freed = self.constraints_freed + num_freed_constraints
+        return {"nodes_before": num_nodes, "nodes_freed": num_freed_nodes, "constraints_freed": num_freed_constraints}
+
+    # Description: enables automatic garbage collection once the unique table holds more than threshold nodes (None
+    # disables it). After each automatic collection the threshold grows to growth times the live nodes.
+    def set_auto_collect(self, threshold, growth=DEFAULT_GC_GROWTH):
+        self.gc_threshold = threshold
+        self.gc_growth = growth
+
+    # Description: collects garbage if automatic collection is enabled and the node count crossed the threshold.
+    # Called by Quast set operations once their result is held by a Quast.
+    # Return: dict of collect, or None when no collection was done
+    def collect_if_needed(self):
+        if self.gc_threshold is None or self.get_num_nodes() <= self.gc_threshold:
+            return None
+        stats = self.collect()
+        self.gc_threshold = max(self.gc_threshold, self.gc_growth * self.get_num_nodes())
+        return stats
+
+    # Return: dict with the number of collections and the total number of freed nodes and constraint ids
+    def get_gc_stats(self):
+        return {"collections": self.num_collections, "nodes_freed": self.nodes_freed,
+                "constraints_freed": self.constraints_freed}
+
+    # Description: reorders the constraint ids by sifting to reduce the number of nodes of the live Quasts. Garbage
+    # is collected first, then nodes are rewritten in place, so every live Quast keeps its root and its set.
+    # Return: dict with the number of live nodes before and after reordering and the number of level swaps
+    def reorder(self, max_growth=DEFAULT_MAX_GROWTH):
+        self.collect()
+        quasts = [quast for quast in self.quasts if quast.root_node is not None]
+        reordering = Reordering(self, [quast.root_node for quast in quasts], max_growth)
+        size_before = reordering.size
+        size_after = reordering.sift_all()
+        for quast in quasts:
+            quast.set_tree_size(quast.compute_tree_size())
+        return {"size_before": size_before, "size_after": size_after, "swaps": reordering.num_swaps}
+
+    # Description: enables automatic reordering once the unique table holds more than threshold nodes (None
+    # disables it). After each automatic reordering the threshold grows to growth times the remaining nodes.
+    def set_auto_reorder(self, threshold, growth=DEFAULT_REORDER_GROWTH):
+        self.reorder_threshold = threshold
+        self.reorder_growth = growth
+
+    # Description: reorders if automatic reordering is enabled and the node count crossed the threshold. Called by
+    # Quast set operations once their result is held by a Quast.
+    # Return: dict of reorder, or None when no reordering was done
+    def reorder_if_needed(self):
+        if self.reorder_threshold is None or self.get_num_nodes() <= self.reorder_threshold:
+            return None
+        stats = self.reorder()
+        self.reorder_threshold = max(self.reorder_threshold, self.reorder_growth * stats["size_after"])
+        return stats
+
+    # Description: counts the nodes (terminals included) of the DAG rooted at root
+    # Return: int
+    def count_nodes(self, root):
+        return self.node_store.count_reachable(root)
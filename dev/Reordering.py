@@ -0,0 +1,148 @@
+from dev import Traversal
+
+
+class Reordering:
+    """
+    Dynamic reordering of the constraint ids of a QuastManager by sifting (Rudell). Levels are exchanged by swapping
+    adjacent levels in place: a node keeps its identity and the set it represents, only the constraint it tests and
+    its successors change, so the roots held by Quasts stay valid. Every node of the unique table must be reachable
+    from the given roots (QuastManager.reorder collects garbage first).
+    Each Reordering instance has the following variable attributes
+        manager:        QuastManager whose constraint ids are reordered
+        node_store:     Node store of manager
+        order:          Constraint id at each level
+        refcounts:      Number of references to each live node (from live nodes and from roots)
+        nodes_by_id:    Live nodes testing each constraint id
+        size:           Number of live nodes
+        max_growth:     Sifting a constraint id in one direction stops when size exceeds max_growth times the best size
+        num_swaps:      Number of adjacent level swaps done
+    """
+
+    def __init__(self, manager, roots, max_growth):
+        self.manager = manager
+        self.node_store = manager.node_store
+        self.max_growth = max_growth
+        self.num_swaps = 0
+        self.refcounts = {}
+        self.nodes_by_id = {}
+        for root in roots:
+            if root.is_terminal():
+                continue
+            if root not in self.refcounts:
+                for node in Traversal.post_order(root):
+                    if not node.is_terminal() and node not in self.refcounts:
+                        self.refcounts[node] = 0
+                        self.nodes_by_id.setdefault(node.constraint_id, set()).add(node)
+                        self.__reference(node.true_branch_node)
+                        self.__reference(node.false_branch_node)
+            self.__reference(root)
+        self.size = len(self.refcounts)
+        # constraint ids without live nodes are moved below all others, so sifting only crosses populated levels
+        levels = manager.levels
+        self.order = sorted(range(len(levels)), key=lambda constraint_id: (constraint_id not in self.nodes_by_id,
+                                                                           levels[constraint_id]))
+        for level, constraint_id in enumerate(self.order):
+            levels[constraint_id] = level
+
+    # Description: sifts every constraint id with live nodes, the most populated first
+    # Return: number of live nodes after reordering
+    def sift_all(self):
+        constraint_ids = sorted(self.nodes_by_id, key=lambda constraint_id: -len(self.nodes_by_id[constraint_id]))
+        for constraint_id in constraint_ids:
+            self.sift(constraint_id)
+        return self.size
+
+    # Description: moves constraint_id through all populated levels, first towards the closer end, and leaves it at
+    # the level where the number of live nodes was smallest
+    def sift(self, constraint_id):
+        levels = self.manager.levels
+        last_level = len(self.nodes_by_id) - 1
+        best_size = self.size
+        best_level = levels[constraint_id]
+        if levels[constraint_id] > last_level // 2:
+            targets = (last_level, 0)
+        else:
+            targets = (0, last_level)
+        for target in targets:
+            while levels[constraint_id] != target and self.size <= self.max_growth * best_size:
+                if levels[constraint_id] < target:
+                    self.swap(levels[constraint_id])
+                else:
+                    self.swap(levels[constraint_id] - 1)
+                if self.size < best_size:
+                    best_size = self.size
+                    best_level = levels[constraint_id]
+        while levels[constraint_id] < best_level:
+            self.swap(levels[constraint_id])
+        while levels[constraint_id] > best_level:
+            self.swap(levels[constraint_id] - 1)
+
+    # Description: exchanges the constraint ids at level and level + 1. Nodes testing the upper constraint id x with
+    # a successor testing the lower constraint id y are rewritten in place from ite(x, ite(y, f11, f10),
+    # ite(y, f01, f00)) to ite(y, ite(x, f11, f01), ite(x, f10, f00)).
+    def swap(self, level):
+        upper_id = self.order[level]
+        lower_id = self.order[level + 1]
+        upper_nodes = self.nodes_by_id[upper_id]
+        lower_nodes = self.nodes_by_id[lower_id]
+        for node in list(upper_nodes):
+            true_branch_node = node.true_branch_node
+            false_branch_node = node.false_branch_node
+            is_true_lower = not true_branch_node.is_terminal() and true_branch_node.constraint_id == lower_id
+            is_false_lower = not false_branch_node.is_terminal() and false_branch_node.constraint_id == lower_id
+            if not is_true_lower and not is_false_lower:
+                continue
+            if is_true_lower:
+                f11, f10 = true_branch_node.true_branch_node, true_branch_node.false_branch_node
+            else:
+                f11, f10 = true_branch_node, true_branch_node
+            if is_false_lower:
+                f01, f00 = false_branch_node.true_branch_node, false_branch_node.false_branch_node
+            else:
+                f01, f00 = false_branch_node, false_branch_node
+            new_true_branch_node = self.__make_node(upper_id, f11, f01)
+            new_false_branch_node = self.__make_node(upper_id, f10, f00)
+            self.__reference(new_true_branch_node)
+            self.__reference(new_false_branch_node)
+            upper_nodes.remove(node)
+            lower_nodes.add(node)
+            self.node_store.replace_node(node, lower_id, new_true_branch_node, new_false_branch_node)
+            self.__release(true_branch_node)
+            self.__release(false_branch_node)
+        self.order[level], self.order[level + 1] = lower_id, upper_id
+        self.manager.levels[upper_id] = level + 1
+        self.manager.levels[lower_id] = level
+        self.num_swaps = self.num_swaps + 1
+
+    # Return: Node
+    def __make_node(self, constraint_id, true_branch_node, false_branch_node):
+        if true_branch_node is false_branch_node:
+            return true_branch_node
+        node = self.node_store.make_node(constraint_id, true_branch_node, false_branch_node)
+        if node not in self.refcounts:
+            self.refcounts[node] = 0
+            self.nodes_by_id[constraint_id].add(node)
+            self.size = self.size + 1
+            self.__reference(true_branch_node)
+            self.__reference(false_branch_node)
+        return node
+
+    def __reference(self, node):
+        if not node.is_terminal():
+            self.refcounts[node] = self.refcounts[node] + 1
+
+    # Description: drops one reference to node, removing it (and the nodes only it referenced) once unreferenced
+    def __release(self, node):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.is_terminal():
+                continue
+            self.refcounts[node] = self.refcounts[node] - 1
+            if self.refcounts[node] == 0:
+                del self.refcounts[node]
+                self.nodes_by_id[node.constraint_id].discard(node)
+                self.size = self.size - 1
+                stack.append(node.true_branch_node)
+                stack.append(node.false_branch_node)
+                self.node_store.remove_node(node)
@@ -0,0 +1,362 @@
+import islpy as isl
+from fractions import Fraction
+from math import floor, ceil
+
+
+class Simplex:
+    """
+    Incremental general simplex (Dutertre and de Moura) over exact rationals. Every variable has optional lower and
+    upper bounds; rows define slack variables as linear combinations of the other variables. Bounds are asserted and
+    retracted in a stack discipline with push/pop, and check() repairs the current assignment with a few pivots, so a
+    path that differs from its parent by one bound usually costs one pivot. Each Simplex instance has the following
+    variable attributes
+        num_dims:   Number of problem variables (the first variables), the others are slack variables
+        lowers:     Lower bound of each variable (None when unbounded)
+        uppers:     Upper bound of each variable (None when unbounded)
+        values:     Current assignment of each variable
+        rows:       Maps each basic variable to its row, a dict from non-basic variables to coefficients
+        columns:    Maps each non-basic variable to the set of basic variables whose row uses it
+        trail:      Previous bounds (variable, lower, upper) of every bound change, in assertion order
+        levels:     Length of trail at each push
+        candidates: Basic variables whose value or bounds changed since they were last known within bounds (every
+                    basic variable out of its bounds is a candidate)
+        num_pivots: Number of pivots done
+    """
+
+    def __init__(self, num_dims):
+        self.num_dims = num_dims
+        self.lowers = [None] * num_dims
+        self.uppers = [None] * num_dims
+        self.values = [Fraction(0)] * num_dims
+        self.rows = {}
+        self.columns = {var: set() for var in range(num_dims)}
+        self.trail = []
+        self.levels = []
+        self.candidates = set()
+        self.num_pivots = 0
+
+    # Description: adds a slack variable equal to sum(coefficients[i] * x_i) over the problem variables
+    # Return: int -- index of the slack variable
+    def add_row(self, coefficients):
+        slack = len(self.values)
+        row = {}
+        for var, coefficient in enumerate(coefficients):
+            if coefficient == 0:
+                continue
+            if var in self.rows:
+                for non_basic, row_coefficient in self.rows[var].items():
+                    row[non_basic] = row.get(non_basic, 0) + coefficient * row_coefficient
+            else:
+                row[var] = row.get(var, 0) + coefficient
+        row = {var: Fraction(coefficient) for var, coefficient in row.items() if coefficient != 0}
+        self.lowers.append(None)
+        self.uppers.append(None)
+        self.values.append(sum((coefficient * self.values[var] for var, coefficient in row.items()), Fraction(0)))
+        self.rows[slack] = row
+        for var in row:
+            self.columns[var].add(slack)
+        return slack
+
+    def push(self):
+        self.levels.append(len(self.trail))
+
+    # Description: retracts the bounds asserted since the matching push. The assignment and the tableau are kept, the
+    # assignment still satisfies every row and the (looser) bounds of the non-basic variables.
+    def pop(self):
+        level = self.levels.pop()
+        while len(self.trail) > level:
+            var, lower, upper = self.trail.pop()
+            self.lowers[var] = lower
+            self.uppers[var] = upper
+
+    # Return: bool -- False when the bound contradicts the other bound of var
+    def assert_lower(self, var, bound):
+        if self.lowers[var] is not None and bound <= self.lowers[var]:
+            return True
+        if self.uppers[var] is not None and bound > self.uppers[var]:
+            return False
+        self.trail.append((var, self.lowers[var], self.uppers[var]))
+        self.lowers[var] = bound
+        if var in self.rows:
+            self.candidates.add(var)
+        elif self.values[var] < bound:
+            self.__update(var, bound)
+        return True
+
+    # Return: bool -- False when the bound contradicts the other bound of var
+    def assert_upper(self, var, bound):
+        if self.uppers[var] is not None and bound >= self.uppers[var]:
+            return True
+        if self.lowers[var] is not None and bound < self.lowers[var]:
+            return False
+        self.trail.append((var, self.lowers[var], self.uppers[var]))
+        self.uppers[var] = bound
+        if var in self.rows:
+            self.candidates.add(var)
+        elif self.values[var] > bound:
+            self.__update(var, bound)
+        return True
+
+    # Description: searches a rational assignment within all bounds, pivoting with Bland's rule
+    # Return: bool -- whether the asserted bounds are feasible over the rationals
+    def check(self):
+        while True:
+            self.candidates = {var for var in self.candidates if var in self.rows and self.__is_violated(var)}
+            if not self.candidates:
+                return True
+            basic = min(self.candidates)
+            is_below = self.lowers[basic] is not None and self.values[basic] < self.lowers[basic]
+            non_basic = None
+            for var in sorted(self.rows[basic]):
+                coefficient = self.rows[basic][var]
+                can_increase = self.uppers[var] is None or self.values[var] < self.uppers[var]
+                can_decrease = self.lowers[var] is None or self.values[var] > self.lowers[var]
+                if (is_below and coefficient > 0) or (not is_below and coefficient < 0):
+                    if can_increase:
+                        non_basic = var
+                        break
+                elif can_decrease:
+                    non_basic = var
+                    break
+            if non_basic is None:
+                return False
+            self.__pivot_and_update(basic, non_basic, self.lowers[basic] if is_below else self.uppers[basic])
+
+    def __is_violated(self, var):
+        return (self.lowers[var] is not None and self.values[var] < self.lowers[var]) or \
+            (self.uppers[var] is not None and self.values[var] > self.uppers[var])
+
+    # Description: branch and bound on the problem variables over the rationally feasible assignment
+    # Return: True when an integer point satisfies the bounds, False when none does, None when max_nodes branches
+    # did not decide
+    def check_integer(self, max_nodes):
+        budget = [max_nodes]
+        return self.__branch_and_bound(budget)
+
+    def __branch_and_bound(self, budget):
+        if not self.check():
+            return False
+        var = next((var for var in range(self.num_dims) if self.values[var].denominator != 1), None)
+        if var is None:
+            return True
+        if budget[0] <= 0:
+            return None
+        budget[0] = budget[0] - 1
+        value = self.values[var]
+        is_unsure = False
+        for assert_bound, bound in ((self.assert_upper, floor(value)), (self.assert_lower, ceil(value))):
+            self.push()
+            result = self.__branch_and_bound(budget) if assert_bound(var, Fraction(bound)) else False
+            self.pop()
+            if result:
+                return True
+            is_unsure = is_unsure or result is None
+        return None if is_unsure else False
+
+    # Description: sets the non-basic variable var to value, updating the basic variables
+    def __update(self, var, value):
+        delta = value - self.values[var]
+        for basic in self.columns[var]:
+            self.values[basic] = self.values[basic] + self.rows[basic][var] * delta
+            self.candidates.add(basic)
+        self.values[var] = value
+
+    # Description: moves basic to value by changing non_basic, then exchanges their roles in the tableau
+    def __pivot_and_update(self, basic, non_basic, value):
+        theta = (value - self.values[basic]) / self.rows[basic][non_basic]
+        self.values[basic] = value
+        self.values[non_basic] = self.values[non_basic] + theta
+        for other in self.columns[non_basic]:
+            if other != basic:
+                self.values[other] = self.values[other] + self.rows[other][non_basic] * theta
+                self.candidates.add(other)
+        self.__pivot(basic, non_basic)
+        self.candidates.add(non_basic)
+
+    def __pivot(self, basic, non_basic):
+        self.num_pivots = self.num_pivots + 1
+        row = self.rows.pop(basic)
+        pivot_coefficient = row.pop(non_basic)
+        # non_basic = (basic - sum(row)) / pivot_coefficient
+        new_row = {var: -coefficient / pivot_coefficient for var, coefficient in row.items()}
+        new_row[basic] = 1 / pivot_coefficient
+        for var in row:
+            self.columns[var].discard(basic)
+        users = self.columns.pop(non_basic)
+        users.discard(basic)
+        self.columns[basic] = set()
+        for var in new_row:
+            self.columns[var].add(non_basic)
+        for other in users:
+            other_row = self.rows[other]
+            coefficient = other_row.pop(non_basic)
+            for var, new_coefficient in new_row.items():
+                updated = other_row.get(var, 0) + coefficient * new_coefficient
+                if updated == 0:
+                    if var in other_row:
+                        del other_row[var]
+                        self.columns[var].discard(other)
+                else:
+                    if var not in other_row:
+                        self.columns[var].add(other)
+                    other_row[var] = updated
+        self.rows[non_basic] = new_row
+
+
+class PathCondition:
+    """
+    Conjunction of the constraints (or their negations) along a root to node path, decided over the integers with an
+    incremental Simplex. Constraints the simplex cannot represent (constraints with divs, disequalities) are kept
+    aside and the path is then decided by isl, unless one of them is disjoint from another edge of the path according
+    to the pairwise ConstraintRelations. Each PathCondition instance has the following variable attributes
+        constraint_table:   ConstraintTable of the constraint ids pushed
+        relations:          ConstraintRelations of the constraint ids pushed (None to only use the simplex and isl)
+        space:              isl.Space of the path
+        simplex:            Simplex over the parameters and set dimensions of space
+        slacks:             Slack variable of each constraint id added to simplex
+        path:               (constraint_id, is_negated) of every pushed edge
+        disequalities:      Constraint ids of the pushed negated equalities
+        unsupported:        Pushed edges not represented in simplex
+        is_infeasible:      Whether an asserted bound contradicted the previous ones, at each push
+        max_nodes:          Branch and bound budget of each check
+        num_isl_checks:     Number of checks decided by isl
+    """
+
+    DEFAULT_MAX_NODES = 64
+
+    def __init__(self, constraint_table, space, relations=None, max_nodes=DEFAULT_MAX_NODES):
+        self.constraint_table = constraint_table
+        self.relations = relations
+        self.space = space
+        self.num_dims = space.dim(isl.dim_type.param) + space.dim(isl.dim_type.set)
+        self.simplex = Simplex(self.num_dims)
+        self.slacks = {}
+        self.path = []
+        self.disequalities = []
+        self.unsupported = []
+        self.max_nodes = max_nodes
+        self.num_isl_checks = 0
+        self.is_infeasible = []
+
+    # Description: adds the constraint constraint_id (its integer negation when is_negated) to the path
+    def push(self, constraint_id, is_negated):
+        self.path.append((constraint_id, is_negated))
+        self.simplex.push()
+        is_equality = self.constraint_table.is_equality(constraint_id)
+        slack = self.__get_slack(constraint_id)
+        if slack is None:
+            is_asserted = self.__is_pairwise_compatible(constraint_id, is_negated, self.path[:-1])
+            self.unsupported.append((constraint_id, is_negated))
+        elif is_negated and is_equality:
+            self.disequalities.append(constraint_id)
+            is_asserted = self.__is_pairwise_compatible(constraint_id, is_negated, self.unsupported)
+        else:
+            is_asserted = self.__assert(constraint_id, slack, is_negated) and \
+                self.__is_pairwise_compatible(constraint_id, is_negated, self.unsupported)
+        self.is_infeasible.append(not is_asserted or (len(self.is_infeasible) > 0 and self.is_infeasible[-1]))
+
+    def pop(self):
+        constraint_id, is_negated = self.path.pop()
+        self.simplex.pop()
+        self.is_infeasible.pop()
+        if self.slacks.get(constraint_id) is None:
+            self.unsupported.pop()
+        elif is_negated and self.constraint_table.is_equality(constraint_id):
+            self.disequalities.pop()
+
+    # Description: decides whether an integer point satisfies every constraint of the path
+    # Return: bool
+    def is_feasible(self):
+        if len(self.is_infeasible) > 0 and self.is_infeasible[-1]:
+            return False
+        if len(self.unsupported) > 0:
+            if not self.simplex.check():
+                return False
+            return self.__is_isl_feasible()
+        is_integer_feasible = self.__check_disequalities([self.max_nodes])
+        if is_integer_feasible is None:
+            return self.__is_isl_feasible()
+        return is_integer_feasible
+
+    # Description: integer feasibility of the path with its disequalities. A disequality is only split (into its two
+    # strict sides) when the integer point found lies on its hyperplane.
+    # Return: True, False, or None when budget branches did not decide
+    def __check_disequalities(self, budget):
+        is_integer_feasible = self.simplex.check_integer(self.max_nodes)
+        if is_integer_feasible is not True:
+            return is_integer_feasible
+        violated_id = None
+        for constraint_id in self.disequalities:
+            if self.simplex.values[self.slacks[constraint_id]] == -self.constraint_table.keys[constraint_id][4]:
+                violated_id = constraint_id
+                break
+        if violated_id is None:
+            return True
+        if budget[0] <= 0:
+            return None
+        budget[0] = budget[0] - 1
+        slack = self.slacks[violated_id]
+        constant = self.constraint_table.keys[violated_id][4]
+        is_unsure = False
+        for assert_bound, bound in ((self.simplex.assert_upper, -constant - 1),
+                                    (self.simplex.assert_lower, -constant + 1)):
+            self.simplex.push()
+            result = self.__check_disequalities(budget) if assert_bound(slack, Fraction(bound)) else False
+            self.simplex.pop()
+            if result:
+                return True
+            is_unsure = is_unsure or result is None
+        return None if is_unsure else False
+
+    # Description: looks for an edge disjoint from the edge (constraint_id, is_negated) among the given edges sharing a
+    # dimension with it, without building isl sets for the whole path
+    # Return: bool -- False when such an edge was found
+    def __is_pairwise_compatible(self, constraint_id, is_negated, edges):
+        if self.relations is None:
+            return True
+        dims_masks = self.constraint_table.dims_masks
+        dims_mask = dims_masks[constraint_id]
+        for edge_constraint_id, is_edge_negated in edges:
+            if dims_masks[edge_constraint_id] & dims_mask and \
+                    self.relations.is_disjoint(edge_constraint_id, is_edge_negated, constraint_id, is_negated):
+                return False
+        return True
+
+    # Return: bool -- False when the bounds of the constraint contradict the asserted bounds
+    def __assert(self, constraint_id, slack, is_negated):
+        # constraint: slack + constant >= 0 (== 0 for equalities), negation: slack + constant <= -1
+        constant = self.constraint_table.keys[constraint_id][4]
+        if is_negated:
+            return self.simplex.assert_upper(slack, Fraction(-constant - 1))
+        if self.constraint_table.is_equality(constraint_id):
+            return self.simplex.assert_lower(slack, Fraction(-constant)) and \
+                self.simplex.assert_upper(slack, Fraction(-constant))
+        return self.simplex.assert_lower(slack, Fraction(-constant))
+
+    # Return: int -- slack variable of constraint_id, None when the constraint cannot be represented
+    def __get_slack(self, constraint_id):
+        if constraint_id not in self.slacks:
+            _, space, coefficients, divs, _ = self.constraint_table.keys[constraint_id]
+            if divs or len(coefficients) != self.num_dims or space != str(self.space):
+                self.slacks[constraint_id] = None
+            else:
+                self.slacks[constraint_id] = self.simplex.add_row(coefficients)
+        return self.slacks[constraint_id]
+
+    def __is_isl_feasible(self):
+        self.num_isl_checks = self.num_isl_checks + 1
+        path_basic_set = isl.BasicSet.universe(self.space)
+        disjunctive_sets = []
+        for constraint_id, is_negated in self.path:
+            if not is_negated:
+                path_basic_set = path_basic_set.intersect(self.constraint_table.get_basic_set(constraint_id))
+            elif len(self.constraint_table.get_negated_basic_sets(constraint_id)) == 1:
+                path_basic_set = path_basic_set.intersect(self.constraint_table.get_negated_basic_sets(constraint_id)[0])
+            else:
+                disjunctive_sets.append(self.constraint_table.get_negated_set(constraint_id))
+        if path_basic_set.is_empty():
+            return False
+        path_set = isl.Set.from_basic_set(path_basic_set)
+        for disjunctive_set in disjunctive_sets:
+            path_set = path_set.intersect(disjunctive_set)
+        return not path_set.is_empty()
@@ -0,0 +1,65 @@
+# Explicit-stack traversals of Quast DAGs. None of the functions below recurse in Python, so the depth of a DAG is
+# bounded only by memory and not by the interpreter's recursion limit.
+
+
+# Description: returns the successors of node, in the order they are visited
+# Return: tuple of Nodes
+def get_children(node):
+    if node.is_terminal():
+        return ()
+    return node.true_branch_node, node.false_branch_node
+
+
+# Description: yields every node reachable from root once, each node after all of its successors
+# Return: generator of Nodes
+def post_order(root):
+    visited = set()
+    stack = [(root, False)]
+    while stack:
+        node, is_expanded = stack.pop()
+        if is_expanded:
+            yield node
+            continue
+        if node in visited:
+            continue
+        visited.add(node)
+        stack.append((node, True))
+        for child in reversed(get_children(node)):
+            if child not in visited:
+                stack.append((child, False))
+
+
+# Description: computes a value for every node reachable from root bottom-up. visit_terminal(node) gives the value of
+# terminals and visit_node(node, true_value, false_value) the value of other nodes from the values of their
+# successors. The values of all nodes are left in values when a dict is given.
+# Return: value of root
+def transform(root, visit_terminal, visit_node, values=None):
+    if values is None:
+        values = {}
+    for node in post_order(root):
+        if node.is_terminal():
+            values[node] = visit_terminal(node)
+        else:
+            values[node] = visit_node(node, values[node.true_branch_node], values[node.false_branch_node])
+    return values[root]
+
+
+# Description: runs a recursive pass written as a generator function. Instead of calling itself, the pass yields the
+# generator of the recursive call and receives its return value, e.g.
+#     new_true_branch_node = yield self.__pass(node.true_branch_node, ...)
+# The calls are kept on an explicit stack of generators, so passes that carry state along root to node paths are no
+# longer bounded by the recursion limit.
+# Return: return value of call
+def run(call):
+    stack = [call]
+    value = None
+    while stack:
+        try:
+            next_call = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            continue
+        stack.append(next_call)
+        value = None
+    return value